@@ -12,10 +12,13 @@ Usage:
 """
 
 import argparse
+import json
 import logging
 import os
 import sys
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -24,7 +27,9 @@ import yaml
 
 from .github_api import GitHubAPI, RateLimitError
 from .milestone_deriver import (
+    MilestoneIndex,
     build_meta_release_summaries,
+    build_milestone_index,
     derive_cycle_releases,
     derive_last_published,
 )
@@ -40,6 +45,8 @@ from .models import (
     ProgressEntry,
     ProgressState,
     PublishedContext,
+    dumps_json,
+    dumps_json_line,
 )
 from .state_deriver import (
     derive_state,
@@ -47,8 +54,10 @@ from .state_deriver import (
     find_matching_draft_release,
     find_matching_snapshot,
     issue_indicates_draft_ready,
+    snapshot_branch_prefix,
 )
-from .warnings import generate_warnings
+from .warnings import PublishedIndex, build_published_index, generate_warnings
+from .yaml_compat import SafeDumper, SafeLoader
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +72,26 @@ class CollectionAbortedError(Exception):
     """
 
 
+# Repositories are collected concurrently; each repo issues several blocking
+# GitHub calls, so wall time is dominated by request latency. Kept modest to
+# stay clear of GitHub's secondary rate limits on concurrent requests.
+DEFAULT_MAX_WORKERS = 8
+
+# Write buffer for the output file; the dumper emits many small writes.
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# States reached through release automation (a snapshot branch or later);
+# they imply the caller workflow is in place.
+ARTIFACT_STATES = frozenset({
+    ProgressState.SNAPSHOT_ACTIVE,
+    ProgressState.DRAFT_READY,
+    ProgressState.PUBLISHED,
+})
+
+# States counted in repos_planned.
+PLANNED_STATES = ARTIFACT_STATES | {ProgressState.PLANNED}
+
+
 # Repositories that have been split into sub-APIs and will not receive new
 # release-plan.yaml entries. Historical releases remain visible in the table
 # because they flow through all_releases, not the filtered repositories list.
@@ -75,9 +104,13 @@ SPLIT_REPOSITORIES = frozenset({
 
 
 def load_releases_master(path: str) -> Dict:
-    """Load releases-master.yaml from disk."""
-    with open(path, "r") as f:
-        return yaml.safe_load(f)
+    """Load releases-master.yaml from disk.
+
+    The file is handed to the loader in binary mode so libyaml reads the
+    bytes directly instead of going through an intermediate str.
+    """
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def build_published_context_map(
@@ -97,7 +130,7 @@ def build_published_context_map(
 def parse_release_plan(content: str) -> Optional[Dict]:
     """Parse release-plan.yaml content. Returns None on error."""
     try:
-        return yaml.safe_load(content)
+        return yaml.load(content, Loader=SafeLoader)
     except yaml.YAMLError as e:
         logger.warning("Failed to parse release-plan.yaml: %s", e)
         return None
@@ -119,6 +152,7 @@ def collect_historical_entries(
     active_repo_meta_releases: set,
     repo_url_map: Dict[str, str],
     active_entries: Optional[List[ProgressEntry]] = None,
+    milestone_index: Optional[MilestoneIndex] = None,
 ) -> List[ProgressEntry]:
     """Create HISTORICAL entries for repos with cycle releases but no active release-plan.yaml.
 
@@ -139,11 +173,14 @@ def collect_historical_entries(
         if e.target_release_tag
     }
 
-    # Group releases by (repository, meta_release)
+    # Group releases by (repository, meta_release), and by repository for
+    # milestone derivation across meta_release labels
     groups: Dict[tuple, List[Dict]] = {}
+    releases_by_repo: Dict[str, List[Dict]] = defaultdict(list)
     for release in all_releases:
         repo = release.get("repository", "")
         meta = release.get("meta_release", "")
+        releases_by_repo[repo].append(release)
         if not repo or not meta:
             continue
         key = (repo, meta)
@@ -213,10 +250,11 @@ def collect_historical_entries(
         )
 
         entry.cycle_releases = derive_cycle_releases(
-            repo, target_tag, meta_release, all_releases,
+            repo, target_tag, meta_release, releases_by_repo[repo],
+            milestone_index=milestone_index,
         )
         entry.last_published = derive_last_published(
-            repo, target_tag, all_releases,
+            repo, target_tag, releases_by_repo[repo],
         )
 
         entries.append(entry)
@@ -228,13 +266,23 @@ def collect_repo_progress(
     repo_name: str,
     github_url: str,
     api: GitHubAPI,
-    all_releases: List[Dict],
+    repo_releases: List[Dict],
     published_context: PublishedContext,
+    milestone_index: Optional[MilestoneIndex] = None,
+    published_index: Optional[PublishedIndex] = None,
 ) -> Optional[ProgressEntry]:
     """Collect progress for a single repository.
 
+    repo_releases holds this repository's entries from releases-master.yaml
+    (pre-grouped by collect_all); milestone_index and published_index are
+    the collection-wide lookups built from the same file.
+
     Returns None if the repo has no release-plan.yaml.
     """
+    # Prefetch artifacts in one GraphQL round trip where supported; the
+    # calls below are then served from the bundle.
+    api.fetch_repo_bundle(repo_name)
+
     # Read release-plan.yaml
     plan_content = api.get_file_content(repo_name, "release-plan.yaml")
     if plan_content is None:
@@ -279,27 +327,34 @@ def collect_repo_progress(
     # NOT_PLANNED repos skip artifact checks
     if not target_type or target_type == "none":
         entry.state = derive_state(target_type, target_tag, False, [], [])
-        # Still check for orphaned artifacts (W002)
-        branches = api.list_branches(repo_name, prefix="release-snapshot/")
-        if branches:
+        # Still check for orphaned artifacts (W002). Without a target tag no
+        # snapshot can match, so the branch lookup is skipped.
+        if target_tag:
+            branches = api.list_branches(
+                repo_name, prefix=snapshot_branch_prefix(target_tag),
+            )
             snapshot = find_matching_snapshot(branches, target_tag)
             if snapshot:
                 entry.artifacts.snapshot_branch = snapshot
         # Cross-reference milestones and last published
         entry.cycle_releases = derive_cycle_releases(
-            repo_name, target_tag, meta_release, all_releases,
+            repo_name, target_tag, meta_release, repo_releases,
+            milestone_index=milestone_index,
         )
         entry.last_published = derive_last_published(
-            repo_name, target_tag, all_releases,
+            repo_name, target_tag, repo_releases,
         )
         # Generate warnings
-        repo_releases = [r for r in all_releases if r.get("repository") == repo_name]
-        entry.warnings = generate_warnings(entry, repo_releases)
+        entry.warnings = generate_warnings(entry, repo_releases, published_index)
         return entry
 
-    # Active repos: collect artifacts
+    # Active repos: collect artifacts. These run serially; collect_all()
+    # already parallelizes across repos, and a nested pool here would
+    # multiply in-flight requests past the HTTP connection pool size.
     tag_exists = api.tag_exists(repo_name, target_tag)
-    snapshot_branches = api.list_branches(repo_name, prefix="release-snapshot/")
+    snapshot_branches = api.list_branches(
+        repo_name, prefix=snapshot_branch_prefix(target_tag),
+    )
     draft_releases = api.get_draft_releases(repo_name)
     release_issue = api.find_release_issue(repo_name, target_tag)
 
@@ -350,24 +405,22 @@ def collect_repo_progress(
 
     # Cross-reference M1/M3/M4 and last published from releases-master
     entry.cycle_releases = derive_cycle_releases(
-        repo_name, target_tag, meta_release, all_releases,
+        repo_name, target_tag, meta_release, repo_releases,
+        milestone_index=milestone_index,
     )
     entry.last_published = derive_last_published(
-        repo_name, target_tag, all_releases,
+        repo_name, target_tag, repo_releases,
     )
 
     # Read calculated API versions from snapshot's release-metadata.yaml
-    if entry.artifacts.snapshot_branch and entry.state in (
-        ProgressState.SNAPSHOT_ACTIVE, ProgressState.DRAFT_READY,
-        ProgressState.PUBLISHED,
-    ):
+    if entry.artifacts.snapshot_branch and entry.state in ARTIFACT_STATES:
         try:
             meta_content = api.get_file_content(
                 repo_name, "release-metadata.yaml",
                 ref=entry.artifacts.snapshot_branch,
             )
             if meta_content:
-                meta = yaml.safe_load(meta_content)
+                meta = yaml.load(meta_content, Loader=SafeLoader)
                 if meta and isinstance(meta.get("apis"), list):
                     entry.snapshot_api_versions = {
                         a["api_name"]: a["api_version"]
@@ -383,12 +436,11 @@ def collect_repo_progress(
     # Fallback for PUBLISHED: read from release tag when snapshot branch unavailable
     if not entry.snapshot_api_versions and entry.state == ProgressState.PUBLISHED and target_tag:
         try:
-            meta_content = api.get_file_content(
-                repo_name, "release-metadata.yaml",
-                ref=target_tag,
+            meta_content = api.get_tag_file_content(
+                repo_name, "release-metadata.yaml", target_tag,
             )
             if meta_content:
-                meta = yaml.safe_load(meta_content)
+                meta = yaml.load(meta_content, Loader=SafeLoader)
                 if meta and isinstance(meta.get("apis"), list):
                     entry.snapshot_api_versions = {
                         a["api_name"]: a["api_version"]
@@ -402,8 +454,7 @@ def collect_repo_progress(
             )
 
     # Generate warnings
-    repo_releases = [r for r in all_releases if r.get("repository") == repo_name]
-    entry.warnings = generate_warnings(entry, repo_releases)
+    entry.warnings = generate_warnings(entry, repo_releases, published_index)
 
     return entry
 
@@ -432,11 +483,53 @@ def compare_progress_data(new_dict: Dict, existing_dict: Dict) -> bool:
     return new_meta != existing_meta
 
 
+def _read_progress_file(path) -> Optional[Dict]:
+    """Load a progress file, JSON or YAML by extension."""
+    with open(path, "rb") as f:
+        if str(path).endswith(".json"):
+            return json.load(f)
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _write_progress_file(path, output: Dict) -> None:
+    """Write a progress tree, JSON, JSON Lines or YAML by extension.
+
+    JSON output lets the viewer embed the data without a YAML round trip.
+    JSON Lines (".jsonl") holds only the progress entries, one per line,
+    for tools that stream-parse them.
+    """
+    # Write to a sibling temp file and rename, so readers never see a
+    # half-written file even if the process dies mid-dump.
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            if str(path).endswith(".json"):
+                f.write(dumps_json(output))
+                f.write("\n")
+            elif str(path).endswith(".jsonl"):
+                for entry in output["progress"]:
+                    f.write(dumps_json_line(entry))
+                    f.write("\n")
+            else:
+                yaml.dump(
+                    output, f, Dumper=SafeDumper,
+                    default_flow_style=False, sort_keys=False, allow_unicode=True,
+                )
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 def collect_all(
     master_path: str,
     output_path: str,
     existing_path: Optional[str] = None,
     api: Optional[GitHubAPI] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    json_output_path: Optional[str] = None,
+    jsonl_output_path: Optional[str] = None,
 ) -> ProgressData:
     """Main collection loop.
 
@@ -447,6 +540,12 @@ def collect_all(
             When provided, only signals data_changed=True if progress or
             meta_releases sections differ from the existing file.
         api: GitHubAPI instance (created from env if not provided).
+        max_workers: Number of repositories collected concurrently.
+        json_output_path: Optional path for an additional JSON copy of the
+            output (e.g. for the viewer). output_path itself is written as
+            JSON when it ends in ".json", YAML otherwise.
+        jsonl_output_path: Optional path for the progress entries as JSON
+            Lines, one entry per line.
 
     Returns:
         ProgressData with all collected entries.
@@ -476,52 +575,94 @@ def collect_all(
         )
 
     context_map = build_published_context_map(repositories)
+
+    # Group releases once so per-repo derivation does not rescan the full list.
+    releases_by_repo: Dict[str, List[Dict]] = defaultdict(list)
+    for release in all_releases:
+        releases_by_repo[release.get("repository", "")].append(release)
+    milestone_index = build_milestone_index(all_releases)
+    published_index = build_published_index(all_releases)
     repo_url_map: Dict[str, str] = {
         r.get("repository", ""): r.get("github_url", "")
         for r in repositories
         if r.get("repository")
     }
 
-    active_states = {ProgressState.PLANNED, ProgressState.SNAPSHOT_ACTIVE,
-                     ProgressState.DRAFT_READY, ProgressState.PUBLISHED}
-
     stats = CollectionStats(repos_scanned=len(repositories))
-    entries: List[ProgressEntry] = []
+
+    # Load per-repo bundles in batched GraphQL queries up front; repos the
+    # batch misses fall back to fetch_repo_bundle() inside the workers.
+    try:
+        api.prefetch_repo_bundles(
+            [r.get("repository", "") for r in repositories if r.get("repository")]
+        )
+    except RateLimitError:
+        raise CollectionAbortedError(
+            f"Rate limit exhausted after {api.api_calls} calls while prefetching "
+            "repository data. Existing releases-progress.yaml left untouched."
+        )
+
+    entries_by_index: Dict[int, ProgressEntry] = {}
     rate_limit_aborted = False
-    failed_repos: List[str] = []
+    failed_indices: List[int] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(
+                collect_repo_progress,
+                repo_data.get("repository", ""),
+                repo_data.get("github_url", ""),
+                api,
+                releases_by_repo.get(repo_data.get("repository", ""), []),
+                context_map.get(
+                    repo_data.get("repository", ""), PublishedContext(None, None)
+                ),
+                milestone_index,
+                published_index,
+            ): index
+            for index, repo_data in enumerate(repositories)
+        }
 
-    for repo_data in repositories:
-        repo_name = repo_data.get("repository", "")
-        github_url = repo_data.get("github_url", "")
-        published_ctx = context_map.get(repo_name, PublishedContext(None, None))
+        # Aggregate as repos finish so a slow repo does not hold up the rest,
+        # and a rate-limit abort cancels pending work straight away.
+        for future in as_completed(futures):
+            index = futures[future]
+            repo_name = repositories[index].get("repository", "")
+            try:
+                entry = future.result()
+            except RateLimitError:
+                logger.error("Rate limit exhausted, aborting collection")
+                rate_limit_aborted = True
+                for pending in futures:
+                    pending.cancel()
+                break
+            except Exception as e:
+                logger.warning("%s: collection failed: %s", repo_name, e)
+                failed_indices.append(index)
+                continue
 
-        try:
-            entry = collect_repo_progress(
-                repo_name, github_url, api,
-                all_releases, published_ctx,
-            )
-            if entry is not None:
-                entries.append(entry)
-                stats.repos_with_plan += 1
-                if entry.state in active_states:
-                    stats.repos_planned += 1
-                # Fully onboarded: has caller workflow (explicit or implied by state)
-                if entry.artifacts.has_caller_workflow or entry.state in {
-                    ProgressState.SNAPSHOT_ACTIVE,
-                    ProgressState.DRAFT_READY,
-                    ProgressState.PUBLISHED,
-                }:
-                    stats.repos_fully_onboarded += 1
-                if entry.artifacts.release_issue:
-                    stats.repos_with_release_issue += 1
-        except RateLimitError:
-            logger.error("Rate limit exhausted, aborting collection")
-            rate_limit_aborted = True
-            break
-        except Exception as e:
-            logger.warning("%s: collection failed: %s", repo_name, e)
-            failed_repos.append(repo_name)
-            continue
+            if entry is None:
+                continue
+            entries_by_index[index] = entry
+            stats.repos_with_plan += 1
+            if entry.state in PLANNED_STATES:
+                stats.repos_planned += 1
+            # Fully onboarded: has caller workflow (explicit or implied by state)
+            if entry.artifacts.has_caller_workflow or entry.state in ARTIFACT_STATES:
+                stats.repos_fully_onboarded += 1
+            if entry.artifacts.release_issue:
+                stats.repos_with_release_issue += 1
+
+    # Restore master-file order so output does not depend on completion order.
+    entries: List[ProgressEntry] = [
+        entries_by_index[index] for index in sorted(entries_by_index)
+    ]
+    failed_repos = [
+        repositories[index].get("repository", "") for index in sorted(failed_indices)
+    ]
+
+    # Memoized GET responses are only valid for this collection run.
+    api.clear_memo()
 
     # Abort before writing partial data: a corrupted releases-progress.yaml
     # is worse than a workflow failure (PA#209, PA#224).
@@ -558,6 +699,7 @@ def collect_all(
     historical = collect_historical_entries(
         all_releases, active_repo_meta_releases, repo_url_map,
         active_entries=entries,
+        milestone_index=milestone_index,
     )
     entries.extend(historical)
     logger.info("Historical entries added: %d", len(historical))
@@ -570,6 +712,7 @@ def collect_all(
     ]
 
     stats.api_calls = api.api_calls
+    stats.not_modified = api.not_modified
     stats.duration_seconds = time.time() - start_time
 
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -596,8 +739,7 @@ def collect_all(
         existing_file = Path(existing_path)
         if existing_file.exists():
             try:
-                with open(existing_file, "r") as f:
-                    existing_data = yaml.safe_load(f) or {}
+                existing_data = _read_progress_file(existing_file) or {}
                 data_changed = compare_progress_data(new_output, existing_data)
                 if not data_changed:
                     # Carry forward last_updated from existing file
@@ -615,16 +757,21 @@ def collect_all(
 
     progress_data.data_changed = data_changed
 
-    # Write output (always write — last_checked changes every run for the viewer)
-    output = progress_data.to_dict()
-    with open(output_path, "w") as f:
-        yaml.dump(output, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+    # Write output (always write — last_checked changes every run for the viewer).
+    # Reuse the tree built for the comparison; only last_updated has moved.
+    new_output["metadata"]["last_updated"] = progress_data.last_updated
+    _write_progress_file(output_path, new_output)
+    if json_output_path:
+        _write_progress_file(json_output_path, new_output)
+    if jsonl_output_path:
+        _write_progress_file(jsonl_output_path, new_output)
 
     logger.info(
         "Collection complete: %d repos scanned, %d new, %d with plan, %d planned, "
-        "%d API calls in %.1fs, data_changed=%s",
+        "%d API calls (+%d not modified) in %.1fs, data_changed=%s",
         stats.repos_scanned, stats.repos_new, stats.repos_with_plan,
-        stats.repos_planned, stats.api_calls, stats.duration_seconds, data_changed,
+        stats.repos_planned, stats.api_calls, stats.not_modified,
+        stats.duration_seconds, data_changed,
     )
 
     return progress_data
@@ -641,12 +788,28 @@ def main():
     )
     parser.add_argument(
         "--output", required=True,
-        help="Path to write releases-progress.yaml",
+        help="Path to write releases-progress.yaml (JSON if it ends in .json)",
+    )
+    parser.add_argument(
+        "--json-output", required=False, default=None,
+        help="Also write the progress data as JSON to this path",
+    )
+    parser.add_argument(
+        "--jsonl-output", required=False, default=None,
+        help="Also write the progress entries as JSON Lines to this path",
     )
     parser.add_argument(
         "--existing", required=False, default=None,
         help="Path to existing releases-progress.yaml for change comparison",
     )
+    parser.add_argument(
+        "--cache-dir", required=False, default=None,
+        help="Directory for the persistent conditional-request (ETag) cache",
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=DEFAULT_MAX_WORKERS,
+        help=f"Repositories collected concurrently (default: {DEFAULT_MAX_WORKERS})",
+    )
     parser.add_argument(
         "--debug", action="store_true",
         help="Enable debug logging",
@@ -658,8 +821,13 @@ def main():
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
 
+    api = GitHubAPI(cache_dir=args.cache_dir)
     try:
-        result = collect_all(args.master, args.output, existing_path=args.existing)
+        result = collect_all(
+            args.master, args.output, existing_path=args.existing, api=api,
+            max_workers=args.max_workers, json_output_path=args.json_output,
+            jsonl_output_path=args.jsonl_output,
+        )
 
         # Output data_changed for workflow consumption
         github_output = os.environ.get("GITHUB_OUTPUT")
@@ -674,6 +842,7 @@ def main():
         print(f"Repos with plan: {stats.repos_with_plan}")
         print(f"Repos planned: {stats.repos_planned}")
         print(f"API calls: {stats.api_calls}")
+        print(f"Not modified (304): {stats.not_modified}")
         print(f"Duration: {stats.duration_seconds:.1f}s")
         print(f"Data changed: {result.data_changed}")
         print(f"::endgroup::")
@@ -684,6 +853,9 @@ def main():
     except Exception as e:
         logger.error("Collection failed: %s", e)
         sys.exit(1)
+    finally:
+        # Cached validators stay valid even when the run aborts.
+        api.save_cache()
 
 
 if __name__ == "__main__":
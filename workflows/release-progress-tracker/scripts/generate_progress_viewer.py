@@ -11,13 +11,19 @@ Usage:
 """
 
 import argparse
+import base64
+import gzip
 import json
 import logging
 import os
+import re
 import sys
 
 import yaml
 
+from .models import dumps_json
+from .yaml_compat import SafeLoader
+
 logger = logging.getLogger(__name__)
 
 # Default paths relative to this script
@@ -28,12 +34,55 @@ DEFAULT_SHARED_ASSETS = os.path.join(
     TRACKER_DIR, "..", "release-collector", "templates"
 )
 
+# Template placeholders, substituted in one pass (see _render_template).
+PLACEHOLDER_RE = re.compile(r"\{\{(VIEWER_STYLES|VIEWER_LIBRARY|PROGRESS_DATA)\}\}")
+
+
+def _render_template(template: str, values: dict) -> str:
+    """Substitute all placeholders in a single scan of the template.
+
+    Inserted content is never rescanned, so braces inside the shared
+    library or the data cannot be mistaken for placeholders.
+    """
+    parts = PLACEHOLDER_RE.split(template)
+    # split() interleaves literal text (even) with captured names (odd).
+    parts[1::2] = [values[name] for name in parts[1::2]]
+    return "".join(parts)
+
+
+def _compress_json(data_json: str) -> str:
+    """Return a JS string literal holding base64-encoded gzip of the JSON.
+
+    mtime is pinned so identical data yields an identical viewer.
+    """
+    blob = gzip.compress(data_json.encode("utf-8"), compresslevel=9, mtime=0)
+    return json.dumps(base64.b64encode(blob).decode("ascii"))
+
+
+def _prefer_json_sibling(data_path: str) -> str:
+    """Use a same-named .json next to a YAML data file when it is current.
+
+    The collector can write both (--json-output); reading the JSON skips a
+    full YAML parse and re-serialisation of the progress data.
+    """
+    stem, ext = os.path.splitext(data_path)
+    if ext not in (".yaml", ".yml"):
+        return data_path
+    sibling = stem + ".json"
+    if (
+        os.path.exists(sibling)
+        and os.path.getmtime(sibling) >= os.path.getmtime(data_path)
+    ):
+        return sibling
+    return data_path
+
 
 def generate_viewer(
     data_path: str,
     output_path: str,
     template_path: str = DEFAULT_TEMPLATE,
     shared_assets_dir: str = DEFAULT_SHARED_ASSETS,
+    compress: bool = True,
 ) -> str:
     """Generate a self-contained HTML viewer from progress data.
 
@@ -42,19 +91,21 @@ def generate_viewer(
         output_path: Path to write the output HTML file
         template_path: Path to progress-template.html
         shared_assets_dir: Directory containing viewer-styles.css and viewer-lib.js
+        compress: Embed the data as base64 gzip (decoded in the browser with
+            DecompressionStream) instead of a plain JSON literal
 
     Returns:
         Path to the generated HTML file
     """
-    # Read progress data
+    # Read progress data. JSON is embedded verbatim; YAML is converted.
+    data_path = _prefer_json_sibling(data_path)
     logger.info("Reading data from: %s", data_path)
-    with open(data_path, "r") as f:
+    with open(data_path, "r", encoding="utf-8") as f:
         if data_path.endswith(".json"):
-            data = json.load(f)
+            data_json = f.read().rstrip()
         else:
-            data = yaml.safe_load(f)
-
-    data_json = json.dumps(data, indent=2, default=str)
+            data = yaml.load(f, Loader=SafeLoader)
+            data_json = dumps_json(data)
 
     # Read template
     logger.info("Reading template from: %s", template_path)
@@ -74,14 +125,15 @@ def generate_viewer(
         library = f.read()
 
     # Inject into template
-    html = template
-    html = html.replace("{{VIEWER_STYLES}}", styles)
-    html = html.replace("{{VIEWER_LIBRARY}}", library)
-    html = html.replace("{{PROGRESS_DATA}}", data_json)
+    html = _render_template(template, {
+        "VIEWER_STYLES": styles,
+        "VIEWER_LIBRARY": library,
+        "PROGRESS_DATA": _compress_json(data_json) if compress else data_json,
+    })
 
     # Write output
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-    with open(output_path, "w") as f:
+    with open(output_path, "w", encoding="utf-8") as f:
         f.write(html)
 
     logger.info("Generated viewer: %s (%d bytes)", output_path, len(html))
@@ -108,6 +160,10 @@ def main():
         "--shared-assets", default=DEFAULT_SHARED_ASSETS,
         help="Directory containing viewer-styles.css and viewer-lib.js",
     )
+    parser.add_argument(
+        "--no-compress", action="store_true",
+        help="Embed the data as a plain JSON literal instead of base64 gzip",
+    )
     parser.add_argument(
         "--debug", action="store_true",
         help="Enable debug logging",
@@ -125,6 +181,7 @@ def main():
             output_path=args.output,
             template_path=args.template,
             shared_assets_dir=args.shared_assets,
+            compress=not args.no_compress,
         )
         print(f"Generated: {result}")
     except FileNotFoundError as e:
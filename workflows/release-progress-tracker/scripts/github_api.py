@@ -3,24 +3,115 @@
 Uses authenticated requests when available and can fall back to public
 requests for artifacts that do not require repository-scoped access.
 All methods return parsed data or None on 404.
+
+When authenticated, fetch_repo_bundle() loads the per-repo artifacts the
+collector needs with a single GraphQL query; the REST methods below answer
+from that bundle where it is complete and fall back to REST otherwise.
+prefetch_repo_bundles() loads many bundles at once, batching repositories
+as aliases of one query.
 """
 
 import base64
+import itertools
+import json
 import logging
 import os
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 
 logger = logging.getLogger(__name__)
 
 ORG = "camaraproject"
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+SNAPSHOT_BRANCH_PREFIX = "release-snapshot/"
+RELEASE_ISSUE_LABEL = "release-issue"
+CALLER_WORKFLOW_PATH = ".github/workflows/release-automation.yml"
+
+# Files read from main that are served from the repo bundle.
+BUNDLE_FILES = {
+    "plan": "release-plan.yaml",
+    "callerWorkflow": CALLER_WORKFLOW_PATH,
+}
+
+# Per-repository selection shared by the single and batched bundle queries.
+REPO_BUNDLE_FRAGMENT = """
+fragment RepoBundle on Repository {
+  plan: object(expression: "main:release-plan.yaml") { ... on Blob { text } }
+  callerWorkflow: object(expression: "main:.github/workflows/release-automation.yml") {
+    ... on Blob { text }
+  }
+  snapshots: refs(refPrefix: "refs/heads/release-snapshot/", first: 100) {
+    pageInfo { hasNextPage }
+    nodes { name }
+  }
+  tags: refs(
+    refPrefix: "refs/tags/", first: 100,
+    orderBy: {field: TAG_COMMIT_DATE, direction: DESC}
+  ) {
+    pageInfo { hasNextPage }
+    nodes { name }
+  }
+  releases(first: 30, orderBy: {field: CREATED_AT, direction: DESC}) {
+    nodes { isDraft }
+  }
+  issues(
+    labels: ["release-issue"], states: OPEN, first: 20,
+    orderBy: {field: CREATED_AT, direction: DESC}
+  ) {
+    pageInfo { hasNextPage }
+    nodes { number url body labels(first: 20) { nodes { name } } }
+  }
+}
+"""
+
+REPO_BUNDLE_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) { ...RepoBundle }
+}
+""" + REPO_BUNDLE_FRAGMENT
+
+# Repositories per batched bundle query; keeps each response well inside
+# GraphQL node and timeout limits.
+BUNDLE_BATCH_SIZE = 10
+
+
+def _batched_bundle_query(count: int) -> str:
+    """GraphQL query fetching `count` repositories as aliases r0..rN."""
+    params = ", ".join(f"$n{i}: String!" for i in range(count))
+    fields = "\n".join(
+        f"  r{i}: repository(owner: $owner, name: $n{i}) {{ ...RepoBundle }}"
+        for i in range(count)
+    )
+    return f"query($owner: String!, {params}) {{\n{fields}\n}}\n" + REPO_BUNDLE_FRAGMENT
+
 
 RETRY_STATUS_CODES = frozenset({502, 503, 504})
 RETRY_ATTEMPTS = 3
 RETRY_BACKOFF_SECONDS = (1, 2, 4)
 
+# Secondary rate limits surface as 403/429 with a Retry-After header; these
+# are transient and worth waiting out, unlike primary budget exhaustion.
+SECONDARY_RATE_LIMIT_STATUS_CODES = frozenset({403, 429})
+
+
+# Keep-alive pool per session; sized to cover the collector's worker threads
+# so concurrent requests reuse connections instead of opening new ones.
+HTTP_POOL_SIZE = 16
+REQUEST_TIMEOUT_SECONDS = 30
+
+ETAG_CACHE_FILE = "etags.json"
+TAG_FILE_CACHE_FILE = "tag-files.json"
+
+# In-run memo of successful GET responses; bounded and short-lived so a
+# long-running process never serves stale repository state.
+MEMO_MAX_ENTRIES = 1024
+MEMO_TTL_SECONDS = 300
+
 
 class RateLimitError(Exception):
     """Raised when GitHub API rate limit is exhausted."""
@@ -29,18 +120,67 @@ class RateLimitError(Exception):
 class GitHubAPI:
     """Thin REST client for GitHub API operations needed by the collector."""
 
-    def __init__(self, token: Optional[str] = None, sleep=time.sleep):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        sleep=time.sleep,
+        cache_dir: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+    ):
         self.session = requests.Session()
         self.public_session = requests.Session()
-        self.token = token or os.environ.get("GITHUB_TOKEN", "")
-        if self.token:
-            self.session.headers["Authorization"] = f"token {self.token}"
+        # Token pool: GITHUB_TOKENS (comma-separated) multiplies the primary
+        # rate-limit budget; GITHUB_TOKEN alone behaves as before.
+        if tokens is None:
+            if token:
+                tokens = [token]
+            else:
+                tokens = _tokens_from_env()
+        self._tokens = [t for t in tokens if t]
+        self.token = self._tokens[0] if self._tokens else ""
+        self._token_cycle = itertools.cycle(range(len(self._tokens)))
+        # (rate-limit resource, token index) -> epoch seconds at which that
+        # exhausted budget resets. REST ("core") and GraphQL budgets are
+        # separate, so a token parked for one stays usable for the other.
+        self._token_reset: Dict[Tuple[str, int], float] = {}
         for session in (self.session, self.public_session):
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=HTTP_POOL_SIZE,
+            )
+            session.mount("https://", adapter)
+            session.headers["Accept-Encoding"] = "gzip, deflate"
             session.headers["Accept"] = "application/vnd.github+json"
             session.headers["X-GitHub-Api-Version"] = "2022-11-28"
         self.api_calls = 0
+        # 304 revalidations; free against the primary rate limit, so they are
+        # tracked apart from api_calls.
+        self.not_modified = 0
+        self._bundles: Dict[str, Dict] = {}
+        # Requests are issued from collector worker threads.
+        self._lock = threading.Lock()
         # Injectable so tests can avoid real backoff sleeps.
         self._sleep = sleep
+        # Conditional-GET cache: request key -> {etag, last_modified, body}.
+        # 304 responses do not count against the primary rate limit.
+        self._etag_cache_path = (
+            os.path.join(cache_dir, ETAG_CACHE_FILE) if cache_dir else None
+        )
+        self._etag_cache: Dict[str, Dict] = self._load_etag_cache()
+        # Keys revalidated or stored this run; save_cache() persists only
+        # these so entries for requests no longer made are dropped.
+        self._etag_used: Set[str] = set()
+        # Files read at a release tag: "repo@tag:path" -> content. Tags are
+        # immutable, so entries never need revalidation.
+        self._tag_file_cache_path = (
+            os.path.join(cache_dir, TAG_FILE_CACHE_FILE) if cache_dir else None
+        )
+        self._tag_file_cache: Dict[str, str] = _load_json_cache(
+            self._tag_file_cache_path, "tag file"
+        )
+        # Pruned like _etag_used, so tags that leave releases-master drop out.
+        self._tag_file_used: Set[str] = set()
+        # (public, path, params) -> (stored_at, response); see _get().
+        self._memo: "OrderedDict[Tuple, Tuple[float, requests.Response]]" = OrderedDict()
 
     def _request(
         self,
@@ -54,11 +194,44 @@ class GitHubAPI:
 
         Retries up to RETRY_ATTEMPTS times on HTTP 502/503/504 and on
         connection / timeout errors with exponential backoff (1s, 2s, 4s).
-        404 and other 4xx responses are returned to the caller without
-        retry. Rate-limit exhaustion raises RateLimitError immediately.
+        Secondary rate limits (403/429 with Retry-After, or a bare 429) are
+        retried after the advertised delay. 404 and other 4xx responses are
+        returned to the caller without retry. A pooled token that reports an
+        exhausted budget is parked for that rate-limit resource until its
+        reset time and later requests move to the next token;
+        RateLimitError is raised once no token has budget left.
         """
-        session = self.public_session if public or not self.token else self.session
+        authenticated = bool(self.token) and not public
+        session = self.session if authenticated else self.public_session
+        resource = "graphql" if url == GRAPHQL_URL else "core"
+        token_index = None
+        if authenticated:
+            token_index = self._next_token(resource)
+            if token_index is None:
+                raise RateLimitError(
+                    f"GitHub API rate limit exhausted for all "
+                    f"{len(self._tokens)} tokens after {self.api_calls} calls"
+                )
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                "Authorization": f"token {self._tokens[token_index]}",
+            }
+
+        cache_key = None
+        if self._etag_cache_path and method == "GET":
+            cache_key = json.dumps(
+                [url, sorted((kwargs.get("params") or {}).items()), public]
+            )
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                headers = dict(kwargs.get("headers") or {})
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+                kwargs["headers"] = headers
 
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT_SECONDS)
         for attempt in range(RETRY_ATTEMPTS + 1):
             try:
                 resp = session.request(method, url, **kwargs)
@@ -79,7 +252,12 @@ class GitHubAPI:
                 )
                 raise
 
-            self.api_calls += 1
+            with self._lock:
+                if resp.status_code == 304:
+                    self.not_modified += 1
+                else:
+                    self.api_calls += 1
+                api_calls = self.api_calls
 
             # Rate-limit check first: an exhausted budget should abort
             # collection regardless of status code on this response.
@@ -87,12 +265,35 @@ class GitHubAPI:
             if remaining is not None:
                 remaining_int = int(remaining)
                 if remaining_int == 0:
-                    raise RateLimitError(
-                        f"GitHub API rate limit exhausted after {self.api_calls} calls"
-                    )
+                    if token_index is not None and len(self._tokens) > 1:
+                        # GitHub reports 0 remaining on the last allowed call,
+                        # so a successful response is kept and only later
+                        # calls move on. A rejected one is retried on the
+                        # next token; parking bounds this by the pool size.
+                        exhausted = (
+                            resp.headers.get("X-RateLimit-Resource") or resource
+                        )
+                        self._park_token(token_index, exhausted, resp)
+                        if resp.status_code >= 400 and exhausted == resource:
+                            return self._request(method, url, public=public, **kwargs)
+                    else:
+                        raise RateLimitError(
+                            f"GitHub API rate limit exhausted after {api_calls} calls"
+                        )
                 if remaining_int < 50:
                     logger.warning("GitHub API rate limit low: %d remaining", remaining_int)
 
+            retry_after = self._secondary_rate_limit_delay(resp, attempt)
+            if retry_after is not None and attempt < RETRY_ATTEMPTS:
+                logger.warning(
+                    "Request to %s hit secondary rate limit (%d); retrying in %ds "
+                    "(attempt %d/%d)",
+                    url, resp.status_code, retry_after,
+                    attempt + 1, RETRY_ATTEMPTS,
+                )
+                self._sleep(retry_after)
+                continue
+
             if resp.status_code in RETRY_STATUS_CODES and attempt < RETRY_ATTEMPTS:
                 delay = RETRY_BACKOFF_SECONDS[attempt]
                 logger.warning(
@@ -109,19 +310,223 @@ class GitHubAPI:
                     url, resp.status_code, RETRY_ATTEMPTS,
                 )
 
+            if cache_key is not None:
+                return self._apply_etag_cache(cache_key, resp)
             return resp
 
         raise RuntimeError(f"Request to {url} exhausted retries unexpectedly")
 
+    def _next_token(self, resource: str) -> Optional[int]:
+        """Return the next pooled token index with resource budget, or None."""
+        with self._lock:
+            now = time.time()
+            for _ in range(len(self._tokens)):
+                index = next(self._token_cycle)
+                if self._token_reset.get((resource, index), 0) <= now:
+                    return index
+        return None
+
+    def _park_token(self, index: int, resource: str, resp) -> None:
+        """Skip a token for resource until its X-RateLimit-Reset time.
+
+        The reset is clamped to the future so a stale or clock-skewed header
+        cannot hand the exhausted token straight back.
+        """
+        reset = resp.headers.get("X-RateLimit-Reset")
+        now = time.time()
+        reset_at = max(float(reset), now + 1) if reset else now + 3600
+        with self._lock:
+            self._token_reset[(resource, index)] = reset_at
+        logger.warning(
+            "GitHub token %d/%d exhausted for %s; rotating to the next token",
+            index + 1, len(self._tokens), resource,
+        )
+
+    def _apply_etag_cache(self, cache_key: str, resp) -> requests.Response:
+        """Serve 304s from the cache and record validators from 200s."""
+        if resp.status_code == 304:
+            cached = self._etag_cache.get(cache_key)
+            if cached is not None:
+                with self._lock:
+                    self._etag_used.add(cache_key)
+                replay = requests.Response()
+                replay.status_code = 200
+                replay._content = cached["body"].encode("utf-8")
+                replay.encoding = "utf-8"
+                replay.headers.update(resp.headers)
+                replay.url = getattr(resp, "url", None)
+                return replay
+        elif resp.status_code == 200:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                with self._lock:
+                    self._etag_cache[cache_key] = {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "body": resp.text,
+                    }
+                    self._etag_used.add(cache_key)
+        return resp
+
+    def _load_etag_cache(self) -> Dict[str, Dict]:
+        return _load_json_cache(self._etag_cache_path, "ETag")
+
+    def save_cache(self) -> None:
+        """Persist the on-disk caches to cache_dir (no-op if disabled).
+
+        Conditional-request and tag file entries not used during this run
+        are pruned.
+        """
+        if not self._etag_cache_path:
+            return
+        os.makedirs(os.path.dirname(self._etag_cache_path), exist_ok=True)
+        with self._lock:
+            etag_cache = {
+                key: entry for key, entry in self._etag_cache.items()
+                if key in self._etag_used
+            }
+            tag_file_cache = {
+                key: content for key, content in self._tag_file_cache.items()
+                if key in self._tag_file_used
+            }
+            _write_json_cache(self._etag_cache_path, etag_cache)
+            _write_json_cache(self._tag_file_cache_path, tag_file_cache)
+        logger.info(
+            "Saved %d conditional-request and %d tag file cache entries to %s",
+            len(etag_cache), len(tag_file_cache),
+            os.path.dirname(self._etag_cache_path),
+        )
+
+    @staticmethod
+    def _secondary_rate_limit_delay(resp, attempt: int) -> Optional[int]:
+        """Return the backoff for a secondary rate-limit response, else None.
+
+        A 403 without Retry-After is a permission error and is not retried.
+        """
+        if resp.status_code not in SECONDARY_RATE_LIMIT_STATUS_CODES:
+            return None
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(int(retry_after), 1)
+            except ValueError:
+                return RETRY_BACKOFF_SECONDS[min(attempt, RETRY_ATTEMPTS - 1)]
+        if resp.status_code == 429:
+            return RETRY_BACKOFF_SECONDS[min(attempt, RETRY_ATTEMPTS - 1)]
+        return None
+
     def _get(self, path: str, public: bool = False, **kwargs) -> Optional[requests.Response]:
-        """GET request to GitHub API."""
-        url = f"https://api.github.com{path}"
-        return self._request("GET", url, public=public, **kwargs)
+        """GET request to GitHub API.
+
+        Successful responses are memoized per (public, path, params) for
+        MEMO_TTL_SECONDS so repeated lookups within a run cost no request.
+        """
+        key = (public, path, tuple(sorted((kwargs.get("params") or {}).items())))
+        now = time.monotonic()
+        with self._lock:
+            hit = self._memo.get(key)
+            if hit is not None and now - hit[0] < MEMO_TTL_SECONDS:
+                self._memo.move_to_end(key)
+                return hit[1]
+
+        # Absolute URLs come from Link pagination headers.
+        url = path if path.startswith("https://") else f"https://api.github.com{path}"
+        resp = self._request("GET", url, public=public, **kwargs)
+        if resp is not None and resp.status_code == 200:
+            with self._lock:
+                self._memo[key] = (now, resp)
+                self._memo.move_to_end(key)
+                while len(self._memo) > MEMO_MAX_ENTRIES:
+                    self._memo.popitem(last=False)
+        return resp
+
+    def clear_memo(self) -> None:
+        """Drop memoized GET responses (called at the end of a collection)."""
+        with self._lock:
+            self._memo.clear()
+
+    def fetch_repo_bundle(self, repo: str) -> Optional[Dict]:
+        """Load release artifacts for a repository with one GraphQL query.
+
+        Covers release-plan.yaml and the caller workflow on main, snapshot
+        branches, tags, draft-release presence and open release issues.
+        Later calls to the REST methods for this repo are answered from the
+        bundle. Returns None (and leaves the REST path in place) when
+        unauthenticated or when the query fails.
+        """
+        if repo in self._bundles:
+            return self._bundles[repo]
+        if not self.token:
+            return None
+        resp = self._request(
+            "POST", GRAPHQL_URL,
+            json={
+                "query": REPO_BUNDLE_QUERY,
+                "variables": {"owner": ORG, "name": repo},
+            },
+        )
+        if resp.status_code != 200:
+            logger.debug("%s: GraphQL bundle returned %d", repo, resp.status_code)
+            return None
+        payload = resp.json() or {}
+        data = (payload.get("data") or {}).get("repository")
+        if payload.get("errors") or data is None:
+            logger.debug("%s: GraphQL bundle errors: %s", repo, payload.get("errors"))
+            return None
+
+        bundle = _parse_repo_bundle(data)
+        with self._lock:
+            self._bundles[repo] = bundle
+        return bundle
+
+    def prefetch_repo_bundles(self, repos: List[str]) -> int:
+        """Load bundles for many repositories, BUNDLE_BATCH_SIZE per query.
+
+        Each repository is an aliased field of one GraphQL query, so a batch
+        costs a single request. Repositories whose alias errors or comes
+        back null are skipped; fetch_repo_bundle() then retries them
+        individually. Returns the number of bundles loaded.
+        """
+        if not self.token:
+            return 0
+        loaded = 0
+        for start in range(0, len(repos), BUNDLE_BATCH_SIZE):
+            batch = repos[start:start + BUNDLE_BATCH_SIZE]
+            variables = {"owner": ORG}
+            variables.update({f"n{i}": name for i, name in enumerate(batch)})
+            resp = self._request(
+                "POST", GRAPHQL_URL,
+                json={"query": _batched_bundle_query(len(batch)), "variables": variables},
+            )
+            if resp.status_code != 200:
+                logger.debug("GraphQL bundle batch returned %d", resp.status_code)
+                continue
+            payload = resp.json() or {}
+            errors = payload.get("errors") or []
+            if any(not e.get("path") for e in errors):
+                logger.debug("GraphQL bundle batch errors: %s", errors)
+                continue
+            failed = {e["path"][0] for e in errors}
+            data = payload.get("data") or {}
+            for i, repo in enumerate(batch):
+                alias = f"r{i}"
+                if alias in failed or data.get(alias) is None:
+                    continue
+                bundle = _parse_repo_bundle(data[alias])
+                with self._lock:
+                    self._bundles[repo] = bundle
+                loaded += 1
+        return loaded
 
     def get_file_content(
         self, repo: str, path: str, ref: str = "main"
     ) -> Optional[str]:
         """Get file content from a repository. Returns None on 404."""
+        files = self._bundles.get(repo, {}).get("files", {})
+        if ref == "main" and path in files:
+            return files[path]
+
         resp = self._get(
             f"/repos/{ORG}/{repo}/contents/{path}",
             params={"ref": ref},
@@ -135,35 +540,63 @@ class GitHubAPI:
             return base64.b64decode(data["content"]).decode("utf-8")
         return data.get("content")
 
+    def get_tag_file_content(self, repo: str, path: str, tag: str) -> Optional[str]:
+        """Get file content at a release tag, cached across runs.
+
+        Published tags do not move, so a hit skips the request entirely.
+        Missing files are not cached in case the tag is created later.
+        """
+        key = f"{repo}@{tag}:{path}"
+        cached = self._tag_file_cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self._tag_file_used.add(key)
+            return cached
+        content = self.get_file_content(repo, path, ref=tag)
+        if content is not None:
+            with self._lock:
+                self._tag_file_cache[key] = content
+                self._tag_file_used.add(key)
+        return content
+
     def list_branches(self, repo: str, prefix: str = "") -> List[str]:
-        """List branch names, optionally filtered by prefix. Handles pagination."""
+        """List branch names, optionally filtered by prefix.
+
+        A prefix is resolved server-side via the matching-refs endpoint in a
+        single call; listing all branches paginates.
+        """
+        snapshots = self._bundles.get(repo, {}).get("snapshot_branches")
+        if snapshots is not None and prefix.startswith(SNAPSHOT_BRANCH_PREFIX):
+            return [b for b in snapshots if b.startswith(prefix)]
+
+        if prefix:
+            resp = self._get(f"/repos/{ORG}/{repo}/git/matching-refs/heads/{prefix}")
+            resp.raise_for_status()
+            return [ref["ref"].removeprefix("refs/heads/") for ref in resp.json()]
+
+        # Follow the Link header rather than counting pages, so an exact
+        # multiple of per_page does not cost a trailing empty request.
         branches = []
-        page = 1
-        while True:
-            resp = self._get(
-                f"/repos/{ORG}/{repo}/branches",
-                params={"per_page": 100, "page": page},
-            )
+        next_path = f"/repos/{ORG}/{repo}/branches?per_page=100"
+        while next_path:
+            resp = self._get(next_path)
             resp.raise_for_status()
-            data = resp.json()
-            if not data:
-                break
-            for b in data:
-                name = b["name"]
-                if not prefix or name.startswith(prefix):
-                    branches.append(name)
-            if len(data) < 100:
-                break
-            page += 1
+            branches.extend(b["name"] for b in resp.json())
+            next_path = resp.links.get("next", {}).get("url")
         return branches
 
     def tag_exists(self, repo: str, tag: str) -> bool:
         """Check if a git tag exists in the repository."""
+        tags = self._bundles.get(repo, {}).get("tags")
+        if tags is not None:
+            return tag in tags
         resp = self._get(f"/repos/{ORG}/{repo}/git/ref/tags/{tag}")
         return resp.status_code == 200
 
     def get_draft_releases(self, repo: str) -> List[Dict]:
         """Get all draft releases for a repository."""
+        if self._bundles.get(repo, {}).get("has_drafts") is False:
+            return []
         resp = self._get(
             f"/repos/{ORG}/{repo}/releases",
             params={"per_page": 30},
@@ -179,7 +612,11 @@ class GitHubAPI:
         target_tag: Optional[str] = None,
     ) -> Optional[Dict]:
         """Find an open workflow-owned release issue for a release tag."""
-        issue = self._find_release_issue(repo, target_tag, public=False)
+        bundled = self._bundles.get(repo, {}).get("release_issues")
+        if bundled is not None:
+            issue = _match_release_issue(bundled, target_tag)
+        else:
+            issue = self._find_release_issue(repo, target_tag, public=False)
         if issue is None and self.token:
             issue = self._find_release_issue(repo, target_tag, public=True)
         return issue
@@ -194,7 +631,7 @@ class GitHubAPI:
         resp = self._get(
             f"/repos/{ORG}/{repo}/issues",
             params={
-                "labels": "release-issue",
+                "labels": RELEASE_ISSUE_LABEL,
                 "state": "open",
                 "per_page": 20,
             },
@@ -203,22 +640,7 @@ class GitHubAPI:
         if resp.status_code == 404:
             return None
         resp.raise_for_status()
-        issues = resp.json()
-        for issue in issues:
-            body = issue.get("body", "") or ""
-            if "<!-- release-automation:workflow-owned -->" not in body:
-                continue
-            if target_tag:
-                marker = f"<!-- release-automation:release-tag:{target_tag} -->"
-                if marker not in body:
-                    continue
-            return {
-                "number": issue["number"],
-                "url": issue["html_url"],
-                "body": body,
-                "labels": [label.get("name", "") for label in issue.get("labels", [])],
-            }
-        return None
+        return _match_release_issue(resp.json(), target_tag)
 
     def find_release_pr(self, repo: str, snapshot_branch: str) -> Optional[Dict]:
         """Find a PR targeting a snapshot branch (release-review → snapshot).
@@ -245,3 +667,108 @@ class GitHubAPI:
                 "url": pr["html_url"],
             }
         return None
+
+
+def _load_json_cache(path: Optional[str], label: str) -> Dict:
+    """Load a JSON cache file, treating a missing or corrupt file as empty."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable %s cache %s: %s", label, path, e)
+        return {}
+
+
+def _write_json_cache(path: str, data: Dict) -> None:
+    """Write a JSON cache file atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _tokens_from_env() -> List[str]:
+    """Read the token pool from GITHUB_TOKENS, falling back to GITHUB_TOKEN."""
+    pooled = [t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",")]
+    pooled = [t for t in pooled if t]
+    if pooled:
+        return pooled
+    single = os.environ.get("GITHUB_TOKEN", "")
+    return [single] if single else []
+
+
+def _match_release_issue(
+    issues: List[Dict], target_tag: Optional[str]
+) -> Optional[Dict]:
+    """Pick the workflow-owned release issue for target_tag from REST-shaped issues."""
+    for issue in issues:
+        body = issue.get("body", "") or ""
+        if "<!-- release-automation:workflow-owned -->" not in body:
+            continue
+        if target_tag:
+            marker = f"<!-- release-automation:release-tag:{target_tag} -->"
+            if marker not in body:
+                continue
+        return {
+            "number": issue["number"],
+            "url": issue["html_url"],
+            "body": body,
+            "labels": [label.get("name", "") for label in issue.get("labels", [])],
+        }
+    return None
+
+
+def _parse_repo_bundle(data: Dict) -> Dict:
+    """Convert a GraphQL repository payload into the bundle served to REST methods.
+
+    Ref and issue lists that were truncated by pagination are left as None
+    so the corresponding REST method falls back to a full lookup.
+    """
+    files = {}
+    for alias, path in BUNDLE_FILES.items():
+        obj = data.get(alias)
+        if obj is None:
+            files[path] = None
+        elif obj.get("text") is not None:
+            files[path] = obj["text"]
+        # Binary or oversized blobs have no text; leave them to REST.
+
+    def _ref_names(alias: str) -> Optional[List[str]]:
+        refs = data.get(alias) or {}
+        if (refs.get("pageInfo") or {}).get("hasNextPage"):
+            return None
+        return [n["name"] for n in refs.get("nodes") or []]
+
+    snapshots = _ref_names("snapshots")
+    tags = _ref_names("tags")
+
+    releases = (data.get("releases") or {}).get("nodes") or []
+    # Newest first, like the REST /issues listing; a truncated list may miss
+    # the matching issue, so it falls back to REST like truncated refs.
+    issue_conn = data.get("issues") or {}
+    if (issue_conn.get("pageInfo") or {}).get("hasNextPage"):
+        issues = None
+    else:
+        issues = [
+            {
+                "number": node["number"],
+                "html_url": node["url"],
+                "body": node.get("body"),
+                "labels": (node.get("labels") or {}).get("nodes") or [],
+            }
+            for node in issue_conn.get("nodes") or []
+        ]
+
+    return {
+        "files": files,
+        "snapshot_branches": (
+            [SNAPSHOT_BRANCH_PREFIX + name for name in snapshots]
+            if snapshots is not None else None
+        ),
+        "tags": set(tags) if tags is not None else None,
+        # Draft payloads (target_commitish) still come from REST when present.
+        "has_drafts": any(r.get("isDraft") for r in releases),
+        "release_issues": issues,
+    }
@@ -8,16 +8,47 @@ Milestones within a meta-release cycle:
 - M4: First public-release
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .models import CycleReleaseApi, CycleReleases, MilestoneRelease
 
+# (repository, tag_prefix, release_type) -> earliest release of that type
+MilestoneIndex = Dict[Tuple[str, str, str], Dict]
+
+MILESTONE_RELEASE_TYPES = ("pre-release-alpha", "pre-release-rc", "public-release")
+
+
+def build_milestone_index(all_releases: List[Dict]) -> MilestoneIndex:
+    """Index the earliest release per (repository, tag prefix, release type).
+
+    Built in a single pass over releases-master.yaml so that milestone
+    lookups in derive_cycle_releases are O(1) per repo. Ties on
+    release_date keep the first release seen, matching a stable sort.
+    """
+    index: MilestoneIndex = {}
+    for release in all_releases:
+        release_type = release.get("release_type")
+        if release_type not in MILESTONE_RELEASE_TYPES:
+            continue
+        tag = release.get("release_tag") or ""
+        dot_index = tag.find(".")
+        if dot_index == -1:
+            continue  # Cannot match any "<prefix>." cycle
+        key = (release.get("repository"), tag[:dot_index + 1], release_type)
+        current = index.get(key)
+        if current is None or (
+            release.get("release_date", "") < current.get("release_date", "")
+        ):
+            index[key] = release
+    return index
+
 
 def derive_cycle_releases(
     repo_name: str,
     target_release_tag: Optional[str],
     meta_release: Optional[str],
     all_releases: List[Dict],
+    milestone_index: Optional[MilestoneIndex] = None,
 ) -> CycleReleases:
     """Derive M1/M3/M4 milestone releases for a repo in a release cycle.
 
@@ -35,7 +66,10 @@ def derive_cycle_releases(
             derive the cycle prefix (e.g., "r1.") for matching releases.
         meta_release: Meta-release label (e.g., "Sync26"). Kept for W004
             mismatch detection, not used for filtering.
-        all_releases: Full releases[] array from releases-master.yaml.
+        all_releases: releases[] entries from releases-master.yaml, either
+            the full array or pre-grouped to this repository.
+        milestone_index: Optional index from build_milestone_index(); when
+            given, milestones are looked up instead of scanning all_releases.
 
     Returns:
         CycleReleases with M1/M3/M4 populated (or None if not found).
@@ -45,6 +79,15 @@ def derive_cycle_releases(
 
     tag_prefix = _get_tag_prefix(target_release_tag)
 
+    if milestone_index is not None:
+        m1, m3, m4 = (
+            _milestone_from_release(
+                milestone_index.get((repo_name, tag_prefix, release_type))
+            )
+            for release_type in MILESTONE_RELEASE_TYPES
+        )
+        return CycleReleases(m1=m1, m3=m3, m4=m4)
+
     # Filter releases for this repo by tag prefix
     cycle_releases = [
         r for r in all_releases
@@ -92,9 +135,8 @@ def derive_last_published(
     if not cycle_releases:
         return None
 
-    # Sort by release_date descending, take most recent
-    cycle_releases.sort(key=lambda r: r.get("release_date", ""), reverse=True)
-    latest = cycle_releases[0]
+    # Most recent by release_date; ISO-8601 strings order chronologically
+    latest = max(cycle_releases, key=_release_date)
 
     # Build API list from actual release data only
     apis = [
@@ -135,31 +177,39 @@ def _find_earliest_by_type(
     Returns a MilestoneRelease with API versions extracted from the actual
     release data, or an empty milestone if no matching release exists.
     """
-    matching = [
-        r for r in cycle_releases
-        if r.get("release_type") == release_type
-    ]
+    earliest = min(
+        (r for r in cycle_releases if r.get("release_type") == release_type),
+        key=_release_date,
+        default=None,
+    )
+    return _milestone_from_release(earliest)
 
-    if not matching:
-        return _empty_milestone()
 
-    # Sort by release_date, take earliest
-    matching.sort(key=lambda r: r.get("release_date", ""))
-    earliest = matching[0]
+def _release_date(release: Dict) -> str:
+    """Sort key: ISO-8601 release_date, which orders correctly as a string."""
+    return release.get("release_date", "")
+
+
+def _milestone_from_release(release: Optional[Dict]) -> MilestoneRelease:
+    """Build a MilestoneRelease from a release, or an empty one for None.
+
+    The API list comes from the actual release data only.
+    """
+    if release is None:
+        return _empty_milestone()
 
-    # Build API list from actual release data only
     apis = [
         CycleReleaseApi(
             api_name=a.get("api_name"),
             api_version=a.get("api_version"),
         )
-        for a in earliest.get("apis", [])
+        for a in release.get("apis", [])
         if a.get("api_name")
     ]
 
     return MilestoneRelease(
-        release_tag=earliest.get("release_tag"),
-        release_date=earliest.get("release_date"),
+        release_tag=release.get("release_tag"),
+        release_date=release.get("release_date"),
         apis=apis,
     )
 
@@ -187,24 +237,25 @@ def build_meta_release_summaries(
         if not mr:
             continue
 
-        if mr not in summaries:
-            summaries[mr] = {
+        s = summaries.get(mr)
+        if s is None:
+            s = summaries[mr] = {
                 "total_apis": 0,
                 "m1_achieved": 0,
                 "m3_achieved": 0,
                 "m4_achieved": 0,
             }
 
-        s = summaries[mr]
-        s["total_apis"] += len(entry.apis)
+        n = len(entry.apis)
+        s["total_apis"] += n
 
         cr = entry.cycle_releases
-        n = len(entry.apis)
-        if cr.m1 and cr.m1.release_tag:
-            s["m1_achieved"] += n
-        if cr.m3 and cr.m3.release_tag:
-            s["m3_achieved"] += n
-        if cr.m4 and cr.m4.release_tag:
-            s["m4_achieved"] += n
+        for milestone, key in (
+            (cr.m1, "m1_achieved"),
+            (cr.m3, "m3_achieved"),
+            (cr.m4, "m4_achieved"),
+        ):
+            if milestone and milestone.release_tag:
+                s[key] += n
 
     return summaries
@@ -1,18 +1,95 @@
 """Data models for release progress tracking.
 
 Dataclasses matching the releases-progress.yaml output schema.
-Each class has a to_dict() method for YAML serialization.
+Each class has a to_dict() method for YAML serialization, derived from its
+fields in declaration order by the Serializable mixin. Field metadata marks
+keys omitted when empty (OMIT_EMPTY) and transient fields (INTERNAL).
+
+Leaf records that are built once and never modified are frozen; entries,
+artifacts and stats are filled in during collection and stay mutable.
 """
 
-from dataclasses import dataclass, field
+import functools
+import json
+import sys
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json writes the same document
+    orjson = None
 
 # Single source of truth for version constants — update here only
 SCHEMA_VERSION = "1.5.0"
 COLLECTOR_VERSION = "1.5.0"
 
 
+def dumps_json(data: Dict) -> str:
+    """Serialize an output tree as indented JSON, using orjson when available.
+
+    Datetimes are passed through to ``str`` and non-ASCII is kept as UTF-8
+    in both paths so the output does not depend on which serializer is
+    installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode("utf-8")
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False)
+
+
+def dumps_json_line(data: Dict) -> str:
+    """Serialize a value as a single compact JSON line (no trailing newline)."""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode("utf-8")
+    return json.dumps(data, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+OMIT_EMPTY = {"omit_empty": True}  # Serialized only when truthy
+INTERNAL = {"internal": True}      # Never serialized
+
+
+@functools.lru_cache(maxsize=None)
+def _serialized_fields(cls) -> Tuple[Tuple[str, bool], ...]:
+    """(name, omit_empty) for each serialized field of a dataclass."""
+    return tuple(
+        (f.name, bool(f.metadata.get("omit_empty")))
+        for f in fields(cls)
+        if not f.metadata.get("internal")
+    )
+
+
+def _encode(value):
+    if isinstance(value, Serializable):
+        return value.to_dict()
+    if isinstance(value, ProgressState):
+        return _STATE_VALUES[value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    return value
+
+
+class Serializable:
+    """Mixin providing to_dict() from dataclass fields."""
+    __slots__ = ()
+
+    def to_dict(self) -> Dict:
+        d = {}
+        for name, omit_empty in _serialized_fields(type(self)):
+            value = getattr(self, name)
+            if omit_empty and not value:
+                continue
+            d[name] = _encode(value)
+        return d
+
+
 class ProgressState(Enum):
     """Release progress state derived from repository artifacts."""
     NOT_PLANNED = "not_planned"
@@ -23,165 +100,91 @@ class ProgressState(Enum):
     HISTORICAL = "historical"  # No release-plan.yaml; derived from releases-master.yaml only
 
 
-@dataclass
-class ProgressWarning:
+# Serialized state strings, resolved once rather than via .value per entry.
+_STATE_VALUES = {state: sys.intern(state.value) for state in ProgressState}
+
+
+@dataclass(slots=True, frozen=True)
+class ProgressWarning(Serializable):
     """Validation warning attached to a progress entry."""
     code: str       # e.g. "W001"
     message: str
     severity: str   # "warning" or "info"
 
-    def to_dict(self) -> Dict:
-        return {"code": self.code, "message": self.message, "severity": self.severity}
-
 
-@dataclass
-class ApiEntry:
+@dataclass(slots=True, frozen=True)
+class ApiEntry(Serializable):
     """API planned for a release (from release-plan.yaml)."""
     api_name: str
     target_api_version: str
     target_api_status: str
-    main_contacts: List[str] = field(default_factory=list)
-
-    def to_dict(self) -> Dict:
-        d = {
-            "api_name": self.api_name,
-            "target_api_version": self.target_api_version,
-            "target_api_status": self.target_api_status,
-        }
-        if self.main_contacts:
-            d["main_contacts"] = self.main_contacts
-        return d
+    main_contacts: List[str] = field(default_factory=list, metadata=OMIT_EMPTY)
 
 
-@dataclass
-class ArtifactInfo:
+@dataclass(slots=True)
+class ArtifactInfo(Serializable):
     """Release artifacts found in the repository."""
     snapshot_branch: Optional[str] = None
     release_pr: Optional[Dict] = None       # {number, state, url}
     draft_release: Optional[Dict] = None    # {name, url}
     release_issue: Optional[Dict] = None    # {number, url}
-    has_caller_workflow: Optional[bool] = None  # Transient — not serialized
-
-    def to_dict(self) -> Dict:
-        return {
-            "snapshot_branch": self.snapshot_branch,
-            "release_pr": self.release_pr,
-            "draft_release": self.draft_release,
-            "release_issue": self.release_issue,
-        }
+    has_caller_workflow: Optional[bool] = field(default=None, metadata=INTERNAL)
 
 
-@dataclass
-class CycleReleaseApi:
+@dataclass(slots=True, frozen=True)
+class CycleReleaseApi(Serializable):
     """API version within a milestone release."""
     api_name: str
     api_version: Optional[str]  # None if milestone not achieved
 
-    def to_dict(self) -> Dict:
-        return {"api_name": self.api_name, "api_version": self.api_version}
-
 
-@dataclass
-class MilestoneRelease:
+@dataclass(slots=True, frozen=True)
+class MilestoneRelease(Serializable):
     """A milestone release (M1/M3/M4) within a meta-release cycle."""
     release_tag: Optional[str]
     release_date: Optional[str]
     apis: List[CycleReleaseApi] = field(default_factory=list)
 
-    def to_dict(self) -> Dict:
-        return {
-            "release_tag": self.release_tag,
-            "release_date": self.release_date,
-            "apis": [a.to_dict() for a in self.apis],
-        }
-
 
-@dataclass
-class CycleReleases:
+@dataclass(slots=True, frozen=True)
+class CycleReleases(Serializable):
     """M1/M3/M4 milestone releases for a repo in a meta-release cycle."""
-    m1: Optional[MilestoneRelease] = None
-    m3: Optional[MilestoneRelease] = None
-    m4: Optional[MilestoneRelease] = None
-
-    def to_dict(self) -> Dict:
-        if not self.m1 and not self.m3 and not self.m4:
-            return {}
-        d = {}
-        if self.m1:
-            d["m1"] = self.m1.to_dict()
-        if self.m3:
-            d["m3"] = self.m3.to_dict()
-        if self.m4:
-            d["m4"] = self.m4.to_dict()
-        return d
+    m1: Optional[MilestoneRelease] = field(default=None, metadata=OMIT_EMPTY)
+    m3: Optional[MilestoneRelease] = field(default=None, metadata=OMIT_EMPTY)
+    m4: Optional[MilestoneRelease] = field(default=None, metadata=OMIT_EMPTY)
 
 
-@dataclass
-class PublishedContext:
+@dataclass(slots=True, frozen=True)
+class PublishedContext(Serializable):
     """Published release context from releases-master.yaml."""
     latest_public_release: Optional[str]
     newest_pre_release: Optional[str]
 
-    def to_dict(self) -> Dict:
-        return {
-            "latest_public_release": self.latest_public_release,
-            "newest_pre_release": self.newest_pre_release,
-        }
-
 
-@dataclass
-class ProgressEntry:
+@dataclass(slots=True)
+class ProgressEntry(Serializable):
     """Full progress entry for a repository."""
     repository: str
     github_url: str
-    release_track: Optional[str] = None
-    meta_release: Optional[str] = None
+    release_track: Optional[str] = field(default=None, metadata=OMIT_EMPTY)
+    meta_release: Optional[str] = field(default=None, metadata=OMIT_EMPTY)
     target_release_tag: Optional[str] = None
     target_release_type: Optional[str] = None
-    dependencies: Optional[Dict] = None
+    dependencies: Optional[Dict] = field(default=None, metadata=OMIT_EMPTY)
     apis: List[ApiEntry] = field(default_factory=list)
     state: ProgressState = ProgressState.NOT_PLANNED
     artifacts: ArtifactInfo = field(default_factory=ArtifactInfo)
-    published_context: PublishedContext = field(
-        default_factory=lambda: PublishedContext(None, None)
-    )
+    published_context: PublishedContext = PublishedContext(None, None)
     cycle_releases: CycleReleases = field(default_factory=CycleReleases)
-    last_published: Optional['MilestoneRelease'] = None
-    snapshot_api_versions: Optional[Dict[str, str]] = None
-    warnings: List[ProgressWarning] = field(default_factory=list)
-    source: Optional[str] = None  # "historical" for IMP-074 entries; omitted for active entries
-
-    def to_dict(self) -> Dict:
-        d = {
-            "repository": self.repository,
-            "github_url": self.github_url,
-        }
-        if self.release_track:
-            d["release_track"] = self.release_track
-        if self.meta_release:
-            d["meta_release"] = self.meta_release
-        d["target_release_tag"] = self.target_release_tag
-        d["target_release_type"] = self.target_release_type
-        if self.dependencies:
-            d["dependencies"] = self.dependencies
-        d["apis"] = [a.to_dict() for a in self.apis]
-        d["state"] = self.state.value
-        d["artifacts"] = self.artifacts.to_dict()
-        d["published_context"] = self.published_context.to_dict()
-        d["cycle_releases"] = self.cycle_releases.to_dict()
-        if self.last_published:
-            d["last_published"] = self.last_published.to_dict()
-        if self.snapshot_api_versions:
-            d["snapshot_api_versions"] = self.snapshot_api_versions
-        if self.warnings:
-            d["warnings"] = [w.to_dict() for w in self.warnings]
-        if self.source:
-            d["source"] = self.source
-        return d
+    last_published: Optional['MilestoneRelease'] = field(default=None, metadata=OMIT_EMPTY)
+    snapshot_api_versions: Optional[Dict[str, str]] = field(default=None, metadata=OMIT_EMPTY)
+    warnings: List[ProgressWarning] = field(default_factory=list, metadata=OMIT_EMPTY)
+    # "historical" for IMP-074 entries; omitted for active entries
+    source: Optional[str] = field(default=None, metadata=OMIT_EMPTY)
 
 
-@dataclass
-class MetaReleaseSummary:
+@dataclass(slots=True)
+class MetaReleaseSummary(Serializable):
     """Aggregate progress summary for a meta-release cycle."""
     name: str
     total_apis: int = 0
@@ -189,18 +192,9 @@ class MetaReleaseSummary:
     m3_achieved: int = 0
     m4_achieved: int = 0
 
-    def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "total_apis": self.total_apis,
-            "m1_achieved": self.m1_achieved,
-            "m3_achieved": self.m3_achieved,
-            "m4_achieved": self.m4_achieved,
-        }
-
 
-@dataclass
-class CollectionStats:
+@dataclass(slots=True)
+class CollectionStats(Serializable):
     """Statistics about the collection run."""
     repos_scanned: int = 0
     repos_with_plan: int = 0
@@ -209,6 +203,7 @@ class CollectionStats:
     repos_with_release_issue: int = 0
     repos_new: int = 0
     api_calls: int = 0
+    not_modified: int = 0             # 304 revalidations, not in api_calls
     duration_seconds: float = 0.0
 
     def to_dict(self) -> Dict:
@@ -220,12 +215,13 @@ class CollectionStats:
             "repos_with_release_issue": self.repos_with_release_issue,
             "repos_new": self.repos_new,
             "api_calls": self.api_calls,
+            "not_modified": self.not_modified,
             "duration_seconds": round(self.duration_seconds, 1),
         }
 
 
-@dataclass
-class ProgressData:
+@dataclass(slots=True)
+class ProgressData(Serializable):
     """Top-level output structure for releases-progress.yaml."""
     last_updated: str = ""            # When progress data last changed
     last_checked: str = ""            # When data was last collected (every run)
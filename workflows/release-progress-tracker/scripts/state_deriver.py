@@ -56,11 +56,19 @@ def find_matching_snapshot(
     if not target_tag:
         return None
 
-    prefix = f"release-snapshot/{target_tag}-"
-    for branch in branches:
-        if branch.startswith(prefix):
-            return branch
-    return None
+    prefix = snapshot_branch_prefix(target_tag)
+    return next((b for b in branches if b.startswith(prefix)), None)
+
+
+def snapshot_branch_prefix(target_tag: Optional[str]) -> str:
+    """Branch-name prefix for a tag's snapshots, or all snapshots if no tag.
+
+    Passing this to list_branches lets the server do the filtering, so
+    find_matching_snapshot only ever sees matching branches.
+    """
+    if not target_tag:
+        return "release-snapshot/"
+    return f"release-snapshot/{target_tag}-"
 
 
 def find_matching_draft_release(
@@ -69,29 +77,36 @@ def find_matching_draft_release(
     snapshot_branch: Optional[str] = None,
 ) -> Optional[dict]:
     """Find a draft release matching the target tag or snapshot branch."""
-    if not draft_releases:
+    if not draft_releases or not (target_tag or snapshot_branch):
         return None
+    return next(
+        (
+            release for release in draft_releases
+            if _draft_matches(release, target_tag, snapshot_branch)
+        ),
+        None,
+    )
 
-    target_tag = target_tag or ""
-    for release in draft_releases:
-        tag = release.get("tag_name", "") or ""
-        name = release.get("name", "") or ""
-        commitish = release.get("target_commitish", "") or ""
-        html_url = release.get("html_url", "") or ""
-
-        if snapshot_branch and commitish == snapshot_branch:
-            return release
-
-        if target_tag and (
-            tag == target_tag
-            or name == target_tag
-            or target_tag in tag
-            or target_tag in name
-            or html_url.endswith(f"/releases/tag/{target_tag}")
-        ):
-            return release
 
-    return None
+def _draft_matches(
+    release: dict, target_tag: Optional[str], snapshot_branch: Optional[str]
+) -> bool:
+    """Whether a draft release belongs to the target tag or snapshot branch."""
+    if snapshot_branch and release.get("target_commitish") == snapshot_branch:
+        return True
+    if not target_tag:
+        return False
+    # The tag must stand alone in the tag name or title ("r4.1",
+    # "Release r4.1", "r4.1-rc"); a plain substring test would let r4.1
+    # match r4.10.
+    mentions_tag = re.compile(
+        rf"(?<![\w.]){re.escape(target_tag)}(?!\.?\d)"
+    ).search
+    return (
+        bool(mentions_tag(release.get("tag_name") or ""))
+        or bool(mentions_tag(release.get("name") or ""))
+        or (release.get("html_url") or "").endswith(f"/releases/tag/{target_tag}")
+    )
 
 
 def issue_indicates_draft_ready(
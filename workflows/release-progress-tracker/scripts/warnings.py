@@ -2,32 +2,89 @@
 
 Warnings annotate progress entries without changing derived state.
 Each check function follows the signature:
-    (entry, repo_releases) -> List[ProgressWarning]
+    (entry, repo_releases, published_index) -> List[ProgressWarning]
 
 Add new checks by writing a _check_* function and appending to CHECKS.
+Decorate a check with @applies_to(...) to run it only for those states;
+undecorated checks run for every entry.
 """
 
-from typing import List
+import operator
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
 from .models import ProgressEntry, ProgressState, ProgressWarning
 
 
+# (repository, release_tag) -> {api_name: published base version}
+PublishedIndex = Dict[Tuple[str, str], Dict[str, str]]
+
+_api_name_version = operator.itemgetter("api_name", "api_version")
+
+
+def build_published_index(
+    releases: Sequence[Mapping], repository: Optional[str] = None
+) -> PublishedIndex:
+    """Index published API base versions by (repository, release_tag).
+
+    Built once per collection so W001 is a dict lookup per entry. Pass
+    repository when indexing a single repository's releases, which may not
+    carry their own repository field. The first release seen for a tag wins.
+    """
+    index: PublishedIndex = {}
+    for rel in releases:
+        tag = rel.get("release_tag")
+        if not tag:
+            continue
+        key = (repository or rel.get("repository", ""), tag)
+        if key in index:
+            continue
+        versions = index[key] = {}
+        for api in rel.get("apis", []):
+            try:
+                name, version = _api_name_version(api)
+            except KeyError:
+                continue  # incomplete entry; nothing to compare against
+            if name and version:
+                # Strip pre-release extension for comparison
+                versions[name] = version.partition("-")[0]
+    return index
+
+
+def applies_to(*states: ProgressState):
+    """Restrict a check to entries in the given states."""
+    def decorate(check_fn):
+        check_fn.states = frozenset(states)
+        return check_fn
+    return decorate
+
+
 def generate_warnings(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: Optional[PublishedIndex] = None,
 ) -> List[ProgressWarning]:
     """Generate validation warnings for a progress entry.
 
     Called after state derivation and releases-master cross-reference.
     Uses only already-collected data — no additional API calls.
+    published_index is built from repo_releases when not supplied.
     """
+    if published_index is None:
+        published_index = build_published_index(repo_releases, entry.repository)
     warnings = []
     for check_fn in CHECKS:
-        warnings.extend(check_fn(entry, repo_releases))
+        states = getattr(check_fn, "states", None)
+        if states is not None and entry.state not in states:
+            continue
+        warnings.extend(check_fn(entry, repo_releases, published_index))
     return warnings
 
 
+@applies_to(ProgressState.PUBLISHED)
 def _check_published_plan_diverged(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: PublishedIndex,
 ) -> List[ProgressWarning]:
     """W001: State=PUBLISHED but plan has different API versions than published release.
 
@@ -35,58 +92,42 @@ def _check_published_plan_diverged(
     release-plan.yaml has been updated with new target versions for the next
     cycle. The plan has "moved on" but still points to the old release tag.
     """
-    if entry.state != ProgressState.PUBLISHED:
-        return []
-
     if not entry.target_release_tag or not entry.apis:
         return []
 
-    # Find the published release matching the target tag
-    published = None
-    for rel in repo_releases:
-        if rel.get("release_tag") == entry.target_release_tag:
-            published = rel
-            break
-
-    if not published:
+    published_versions = published_index.get(
+        (entry.repository, entry.target_release_tag)
+    )
+    if published_versions is None:
         return []
 
-    # Compare planned API versions with published versions
-    published_versions = {}
-    for api in published.get("apis", []):
-        name = api.get("api_name")
-        if name:
-            # Strip pre-release extension for comparison
-            version = api.get("api_version", "")
-            base_version = version.split("-")[0] if version else ""
-            published_versions[name] = base_version
-
-    for api in entry.apis:
-        published_base = published_versions.get(api.api_name)
-        if published_base and api.target_api_version != published_base:
-            return [ProgressWarning(
-                code="W001",
-                message=(
-                    f"Plan targets {api.api_name} {api.target_api_version} "
-                    f"but {entry.target_release_tag} published {published_base}"
-                ),
-                severity="warning",
-            )]
-
-    return []
+    # One warning per diverged API, not just the first.
+    return [
+        ProgressWarning(
+            code="W001",
+            message=(
+                f"Plan targets {api.api_name} {api.target_api_version} "
+                f"but {entry.target_release_tag} published {published_base}"
+            ),
+            severity="warning",
+        )
+        for api in entry.apis
+        if (published_base := published_versions.get(api.api_name))
+        and api.target_api_version != published_base
+    ]
 
 
+@applies_to(ProgressState.NOT_PLANNED)
 def _check_orphaned_snapshot(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: PublishedIndex,
 ) -> List[ProgressWarning]:
     """W002: Snapshot branch exists but target_release_type=none.
 
     Catches orphaned artifacts from previous release cycles that were
     not cleaned up.
     """
-    if entry.state != ProgressState.NOT_PLANNED:
-        return []
-
     if entry.artifacts.snapshot_branch:
         return [ProgressWarning(
             code="W002",
@@ -100,8 +141,11 @@ def _check_orphaned_snapshot(
     return []
 
 
+@applies_to(ProgressState.PUBLISHED)
 def _check_published_not_in_releases_master(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: PublishedIndex,
 ) -> List[ProgressWarning]:
     """W003: State=PUBLISHED but release tag not found in releases-master.yaml.
 
@@ -110,15 +154,11 @@ def _check_published_not_in_releases_master(
     (M1/M3/M4) will be empty because the release data is missing from
     releases-master.yaml.
     """
-    if entry.state != ProgressState.PUBLISHED:
-        return []
-
     if not entry.target_release_tag:
         return []
 
-    for rel in repo_releases:
-        if rel.get("release_tag") == entry.target_release_tag:
-            return []
+    if (entry.repository, entry.target_release_tag) in published_index:
+        return []
 
     return [ProgressWarning(
         code="W003",
@@ -131,7 +171,9 @@ def _check_published_not_in_releases_master(
 
 
 def _check_meta_release_mismatch(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: PublishedIndex,
 ) -> List[ProgressWarning]:
     """W004: Release found by tag prefix has different meta_release label.
 
@@ -175,12 +217,13 @@ def _check_meta_release_mismatch(
     return []
 
 
+@applies_to(ProgressState.PLANNED)
 def _check_no_caller_workflow(
-    entry: ProgressEntry, repo_releases: List[dict]
+    entry: ProgressEntry,
+    repo_releases: Sequence[Mapping],
+    published_index: PublishedIndex,
 ) -> List[ProgressWarning]:
     """W005: Active release plan but no caller workflow installed."""
-    if entry.state != ProgressState.PLANNED:
-        return []
     if entry.artifacts.has_caller_workflow is None or entry.artifacts.has_caller_workflow:
         return []
     return [ProgressWarning(
@@ -0,0 +1,12 @@
+"""PyYAML Loader/Dumper selection shared by the collector, viewer and tests.
+
+Uses the libyaml bindings when PyYAML was built with them, falling back to
+the pure-Python SafeLoader/SafeDumper; both produce the same documents.
+"""
+
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+__all__ = ["SafeDumper", "SafeLoader"]
@@ -2,6 +2,59 @@
 
 import sys
 from pathlib import Path
+from types import MappingProxyType
+
+import pytest
 
 # Ensure scripts package is importable
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.models import ApiEntry, ArtifactInfo, ProgressEntry, ProgressState  # noqa: E402
+
+# Defaults for make_entry; read-only so no test can leak changes into another.
+ENTRY_DEFAULTS = MappingProxyType({
+    "repository": "TestRepo",
+    "github_url": "https://github.com/camaraproject/TestRepo",
+    "state": ProgressState.PLANNED,
+    "target_release_tag": "r4.1",
+    "target_release_type": "pre-release-rc",
+})
+
+
+@pytest.fixture(scope="session")
+def make_entry():
+    """Factory for ProgressEntry objects with sensible defaults."""
+    def _make_entry(**overrides):
+        return ProgressEntry(**{**ENTRY_DEFAULTS, **overrides})
+    return _make_entry
+
+
+# Canonical entries shared across warning tests. ProgressEntry is mutable,
+# so each test gets a fresh instance rather than one per session.
+
+@pytest.fixture
+def published_diverged_entry(make_entry):
+    """PUBLISHED at r4.1 with a plan that moved on to quality-on-demand 2.0.0."""
+    return make_entry(
+        state=ProgressState.PUBLISHED,
+        apis=[ApiEntry("quality-on-demand", "2.0.0", "public")],
+    )
+
+
+@pytest.fixture
+def published_matching_entry(make_entry):
+    """PUBLISHED at r4.1 with a plan still at quality-on-demand 1.1.0."""
+    return make_entry(
+        state=ProgressState.PUBLISHED,
+        apis=[ApiEntry("quality-on-demand", "1.1.0", "public")],
+    )
+
+
+@pytest.fixture
+def orphan_snapshot_entry(make_entry):
+    """NOT_PLANNED with a leftover r4.1 snapshot branch."""
+    return make_entry(
+        state=ProgressState.NOT_PLANNED,
+        target_release_type="none",
+        artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.1-abc123"),
+    )
@@ -0,0 +1,11 @@
+"""Plain helper functions shared by release-progress-tracker tests."""
+
+from collections import defaultdict
+
+
+def by_code(warnings):
+    """Bucket warnings by code in one pass: {code: [ProgressWarning, ...]}."""
+    codes = defaultdict(list)
+    for warning in warnings:
+        codes[warning.code].append(warning)
+    return dict(codes)
@@ -1,7 +1,11 @@
 """Integration tests for the collector orchestrator with mocked GitHub API."""
 
+import bisect
+import json
 import os
 import tempfile
+import time
+from collections import defaultdict
 
 import pytest
 import yaml
@@ -17,6 +21,7 @@ from scripts.collect_progress import (
 )
 from scripts.github_api import GitHubAPI
 from scripts.models import ApiEntry, CycleReleases, ProgressEntry, ProgressState, PublishedContext
+from scripts.yaml_compat import SafeDumper, SafeLoader
 
 INDEPENDENT_RELEASE = {
     "repository": "IndependentRepo",
@@ -31,7 +36,7 @@ INDEPENDENT_RELEASE = {
 
 # --- Fixtures ---
 
-PLAN_RC = yaml.dump({
+PLAN_RC_DICT = {
     "repository": {
         "release_track": "meta-release",
         "meta_release": "Sync26",
@@ -47,9 +52,15 @@ PLAN_RC = yaml.dump({
         "target_api_status": "rc",
         "main_contacts": ["user1"],
     }],
-})
+}
+
+
+@pytest.fixture(scope="session")
+def plan_rc() -> str:
+    return yaml.dump(PLAN_RC_DICT, Dumper=SafeDumper)
 
-PLAN_NONE = yaml.dump({
+
+PLAN_NONE_DICT = {
     "repository": {
         "release_track": "meta-release",
         "meta_release": "Sync26",
@@ -57,7 +68,30 @@ PLAN_NONE = yaml.dump({
         "target_release_type": "none",
     },
     "apis": [],
-})
+}
+
+
+@pytest.fixture(scope="session")
+def plan_none() -> str:
+    return yaml.dump(PLAN_NONE_DICT, Dumper=SafeDumper)
+
+
+PLAN_NONE_FALL25_DICT = {
+    "repository": {
+        "release_track": "meta-release",
+        "meta_release": "Fall25",
+        "target_release_tag": "r3.2",
+        "target_release_type": "none",
+    },
+    "apis": [{"api_name": "quality-on-demand", "target_api_version": "1.0.0",
+              "target_api_status": "stable"}],
+}
+
+
+@pytest.fixture(scope="session")
+def plan_none_fall25() -> str:
+    return yaml.dump(PLAN_NONE_FALL25_DICT, Dumper=SafeDumper)
+
 
 SAMPLE_MASTER = {
     "metadata": {
@@ -97,31 +131,69 @@ SAMPLE_MASTER = {
 }
 
 
+def _load_yaml(path):
+    """Stream-parse a YAML file the way the collector does."""
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _by_repo(flat):
+    """Nest "repo/key" -> value as repo -> {key: value} for cheaper lookups."""
+    nested = defaultdict(dict)
+    for flat_key, value in (flat or {}).items():
+        repo, _, key = flat_key.partition("/")
+        nested[repo][key] = value
+    return nested
+
+
 class MockGitHubAPI:
-    """Mock GitHub API for testing."""
+    """Mock GitHub API for testing.
+
+    Fixtures are given as flat "repo/path" keys and stored per repository.
+    """
 
     def __init__(self, file_contents=None, branches=None, tags=None,
                  draft_releases=None, release_issues=None, release_prs=None):
-        self.file_contents = file_contents or {}
-        self.branches = branches or {}
-        self.tags = tags or set()
+        self.file_contents = _by_repo(file_contents)
+        # Sorted like the matching-refs endpoint, so a prefix is a slice.
+        self.branches = {repo: sorted(names) for repo, names in (branches or {}).items()}
+        self.tags = defaultdict(set)
+        for flat_tag in tags or ():
+            repo, _, tag = flat_tag.partition("/")
+            self.tags[repo].add(tag)
         self.draft_releases = draft_releases or {}
         self.release_issues = release_issues or {}
-        self.release_prs = release_prs or {}
+        self.release_prs = _by_repo(release_prs)
         self.api_calls = 0
+        self.not_modified = 0
+
+    def fetch_repo_bundle(self, repo):
+        return None
+
+    def prefetch_repo_bundles(self, repos):
+        return 0
+
+    def clear_memo(self):
+        pass
 
     def get_file_content(self, repo, path, ref="main"):
         self.api_calls += 1
-        return self.file_contents.get(f"{repo}/{path}")
+        return self.file_contents.get(repo, {}).get(path)
+
+    def get_tag_file_content(self, repo, path, tag):
+        return self.get_file_content(repo, path, ref=tag)
 
     def list_branches(self, repo, prefix=""):
         self.api_calls += 1
-        all_branches = self.branches.get(repo, [])
-        return [b for b in all_branches if not prefix or b.startswith(prefix)]
+        names = self.branches.get(repo, [])
+        if not prefix:
+            return list(names)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return names[bisect.bisect_left(names, prefix):bisect.bisect_left(names, upper)]
 
     def tag_exists(self, repo, tag):
         self.api_calls += 1
-        return f"{repo}/{tag}" in self.tags
+        return tag in self.tags.get(repo, ())
 
     def get_draft_releases(self, repo):
         self.api_calls += 1
@@ -133,21 +205,31 @@ class MockGitHubAPI:
 
     def find_release_pr(self, repo, snapshot_branch):
         self.api_calls += 1
-        return self.release_prs.get(f"{repo}/{snapshot_branch}")
+        return self.release_prs.get(repo, {}).get(snapshot_branch)
 
 
 # --- Tests ---
 
 class TestParseReleasePlan:
-    def test_valid_yaml(self):
-        result = parse_release_plan(PLAN_RC)
-        assert result["repository"]["target_release_type"] == "pre-release-rc"
+    def test_valid_yaml(self, plan_rc):
+        result = parse_release_plan(plan_rc)
+        assert result == PLAN_RC_DICT
 
     def test_invalid_yaml(self):
         result = parse_release_plan("{{invalid")
         assert result is None
 
 
+class TestLoadReleasesMaster:
+    def test_reads_utf8_bytes(self, tmp_path):
+        master_file = tmp_path / "releases-master.yaml"
+        master_file.write_bytes(
+            "repositories:\n- repository: Café\n".encode("utf-8")
+        )
+        result = load_releases_master(str(master_file))
+        assert result["repositories"][0]["repository"] == "Café"
+
+
 class TestBuildPublishedContextMap:
     def test_builds_map(self):
         ctx = build_published_context_map(SAMPLE_MASTER["repositories"])
@@ -164,9 +246,9 @@ class TestCollectRepoProgress:
         )
         assert result is None
 
-    def test_not_planned_state(self):
+    def test_not_planned_state(self, plan_none):
         api = MockGitHubAPI(
-            file_contents={"InactiveRepo/release-plan.yaml": PLAN_NONE},
+            file_contents={"InactiveRepo/release-plan.yaml": plan_none},
         )
         result = collect_repo_progress(
             "InactiveRepo", "https://github.com/camaraproject/InactiveRepo",
@@ -174,9 +256,9 @@ class TestCollectRepoProgress:
         )
         assert result.state == ProgressState.NOT_PLANNED
 
-    def test_planned_state(self):
+    def test_planned_state(self, plan_rc):
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
         )
         result = collect_repo_progress(
             "QualityOnDemand",
@@ -188,9 +270,9 @@ class TestCollectRepoProgress:
         assert result.apis[0].api_name == "quality-on-demand"
         assert result.published_context.latest_public_release == "r3.2"
 
-    def test_snapshot_active_state(self):
+    def test_snapshot_active_state(self, plan_rc):
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
             branches={"QualityOnDemand": ["release-snapshot/r4.1-abc123", "main"]},
             release_prs={"QualityOnDemand/release-snapshot/r4.1-abc123": {
                 "number": 42, "state": "open",
@@ -206,9 +288,9 @@ class TestCollectRepoProgress:
         assert result.artifacts.snapshot_branch == "release-snapshot/r4.1-abc123"
         assert result.artifacts.release_pr["number"] == 42
 
-    def test_draft_ready_state(self):
+    def test_draft_ready_state(self, plan_rc):
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
             branches={"QualityOnDemand": ["release-snapshot/r4.1-abc123"]},
             draft_releases={"QualityOnDemand": [
                 {"name": "r4.1 pre-release-rc", "tag_name": "r4.1",
@@ -223,9 +305,9 @@ class TestCollectRepoProgress:
         assert result.state == ProgressState.DRAFT_READY
         assert result.artifacts.draft_release is not None
 
-    def test_draft_ready_state_from_release_issue_fallback(self):
+    def test_draft_ready_state_from_release_issue_fallback(self, plan_rc):
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
             branches={"QualityOnDemand": ["release-snapshot/r4.1-abc123"]},
             release_issues={"QualityOnDemand": {
                 "number": 82,
@@ -259,9 +341,9 @@ class TestCollectRepoProgress:
             "url": "https://github.com/camaraproject/QualityOnDemand/issues/82",
         }
 
-    def test_published_state(self):
+    def test_published_state(self, plan_rc):
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
             tags={"QualityOnDemand/r4.1"},
         )
         result = collect_repo_progress(
@@ -272,35 +354,37 @@ class TestCollectRepoProgress:
         )
         assert result.state == ProgressState.PUBLISHED
 
-    def test_not_planned_skips_artifact_checks(self):
-        """NOT_PLANNED repos should only call get_file_content + list_branches."""
+    def test_not_planned_skips_artifact_checks(self, plan_none):
+        """NOT_PLANNED repos without a target tag only read release-plan.yaml."""
         api = MockGitHubAPI(
-            file_contents={"InactiveRepo/release-plan.yaml": PLAN_NONE},
+            file_contents={"InactiveRepo/release-plan.yaml": plan_none},
         )
         result = collect_repo_progress(
             "InactiveRepo", "https://github.com/camaraproject/InactiveRepo",
             api, [], PublishedContext(None, None),
         )
+        # get_file_content (1); no tag means no snapshot can match
+        assert api.api_calls == 1
+
+    def test_not_planned_with_tag_checks_orphaned_snapshot(self, plan_none_fall25):
+        """NOT_PLANNED repos with a target tag still list branches for W002."""
+        api = MockGitHubAPI(
+            file_contents={"InactiveRepo/release-plan.yaml": plan_none_fall25},
+        )
+        collect_repo_progress(
+            "InactiveRepo", "https://github.com/camaraproject/InactiveRepo",
+            api, [], PublishedContext(None, None),
+        )
         # get_file_content (1) + list_branches for orphan check (1) = 2
         assert api.api_calls == 2
 
-    def test_warnings_attached(self):
+    def test_warnings_attached(self, plan_none_fall25):
         """Warnings should be generated and attached to entries."""
+        # NOT_PLANNED with a target tag, so the orphaned snapshot check runs
         api = MockGitHubAPI(
-            file_contents={"InactiveRepo/release-plan.yaml": PLAN_NONE},
-            branches={"InactiveRepo": ["release-snapshot/r4.1-abc"]},
+            file_contents={"InactiveRepo/release-plan.yaml": plan_none_fall25},
+            branches={"InactiveRepo": ["release-snapshot/r3.2-abc"]},
         )
-        # Create a plan with a target tag for the orphaned snapshot check
-        plan_none_with_tag = yaml.dump({
-            "repository": {
-                "release_track": "meta-release",
-                "meta_release": "Sync26",
-                "target_release_tag": "r4.1",
-                "target_release_type": "none",
-            },
-            "apis": [],
-        })
-        api.file_contents["InactiveRepo/release-plan.yaml"] = plan_none_with_tag
 
         result = collect_repo_progress(
             "InactiveRepo", "https://github.com/camaraproject/InactiveRepo",
@@ -309,11 +393,11 @@ class TestCollectRepoProgress:
         assert len(result.warnings) >= 1
         assert any(w.code == "W002" for w in result.warnings)
 
-    def test_planned_with_caller_workflow(self):
+    def test_planned_with_caller_workflow(self, plan_rc):
         """PLANNED repo with caller workflow → has_caller_workflow=True, no W005."""
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
                 "QualityOnDemand/.github/workflows/release-automation.yml": "name: release",
             },
         )
@@ -326,10 +410,10 @@ class TestCollectRepoProgress:
         assert result.artifacts.has_caller_workflow is True
         assert not any(w.code == "W005" for w in result.warnings)
 
-    def test_planned_without_caller_workflow(self):
+    def test_planned_without_caller_workflow(self, plan_rc):
         """PLANNED repo without caller workflow → has_caller_workflow=False, W005."""
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
         )
         result = collect_repo_progress(
             "QualityOnDemand",
@@ -416,16 +500,16 @@ class TestCompareProgressData:
 
 
 class TestCollectAll:
-    def test_full_collection(self, tmp_path):
+    def test_full_collection(self, tmp_path, plan_rc, plan_none):
         """End-to-end test with mock API."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
         )
 
@@ -437,7 +521,7 @@ class TestCollectAll:
 
         # Verify output file written with new schema
         assert output_file.exists()
-        output = yaml.safe_load(output_file.read_text())
+        output = _load_yaml(output_file)
         assert "metadata" in output
         assert "progress" in output
         assert len(output["progress"]) == 2
@@ -454,6 +538,51 @@ class TestCollectAll:
         assert meta["repos_fully_onboarded"] == 0  # No caller workflow or active state
         assert meta["repos_with_release_issue"] == 0  # No release issues mocked
 
+    def test_concurrent_collection_preserves_master_order(self, tmp_path, plan_rc):
+        """Entries keep releases-master order regardless of completion order."""
+        names = [f"Repo{i:02d}" for i in range(12)]
+        master_data = {
+            "metadata": SAMPLE_MASTER["metadata"],
+            "repositories": [
+                {"repository": n, "github_url": f"https://github.com/camaraproject/{n}"}
+                for n in names
+            ],
+            "releases": [],
+        }
+        master_file = tmp_path / "releases-master.yaml"
+        output_file = tmp_path / "releases-progress.yaml"
+        master_file.write_text(yaml.dump(master_data, Dumper=SafeDumper))
+
+        class SlowFirstRepoAPI(MockGitHubAPI):
+            def get_file_content(self, repo, path, ref="main"):
+                if repo == names[0]:
+                    time.sleep(0.05)  # finishes after later repos
+                return super().get_file_content(repo, path, ref)
+
+        api = SlowFirstRepoAPI(
+            file_contents={f"{n}/release-plan.yaml": plan_rc for n in names},
+        )
+        result = collect_all(str(master_file), str(output_file), api=api, max_workers=4)
+
+        assert [e.repository for e in result.progress] == names
+
+    def test_failed_write_leaves_existing_output(self, tmp_path, monkeypatch):
+        """The output is replaced atomically; a failing dump keeps the old file."""
+        master_file = tmp_path / "releases-master.yaml"
+        output_file = tmp_path / "releases-progress.yaml"
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
+        output_file.write_text("previous: data\n")
+
+        def failing_dump(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("scripts.collect_progress.yaml.dump", failing_dump)
+        with pytest.raises(OSError):
+            collect_all(str(master_file), str(output_file), api=MockGitHubAPI())
+
+        assert output_file.read_text() == "previous: data\n"
+        assert set(tmp_path.iterdir()) == {master_file, output_file}
+
     def test_collection_aborts_on_per_repo_error(self, tmp_path):
         """Per-repo failures abort the collection rather than silently dropping rows.
 
@@ -472,7 +601,7 @@ class TestCollectAll:
         }
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(master_data))
+        master_file.write_text(yaml.dump(master_data, Dumper=SafeDumper))
 
         class ErrorAPI(MockGitHubAPI):
             def get_file_content(self, repo, path, ref="main"):
@@ -507,7 +636,7 @@ class TestCollectAll:
         }
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(master_data))
+        master_file.write_text(yaml.dump(master_data, Dumper=SafeDumper))
 
         class RateLimitedAPI(MockGitHubAPI):
             def get_file_content(self, repo, path, ref="main"):
@@ -519,64 +648,64 @@ class TestCollectAll:
 
         assert not output_file.exists()
 
-    def test_releases_master_updated_populated(self, tmp_path):
+    def test_releases_master_updated_populated(self, tmp_path, plan_rc):
         """releases_master_updated should be read from master file metadata."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_RC},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_rc},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
         assert result.releases_master_updated == "2026-03-01T00:00:00Z"
-        output = yaml.safe_load(output_file.read_text())
+        output = _load_yaml(output_file)
         assert output["metadata"]["releases_master_updated"] == "2026-03-01T00:00:00Z"
 
 
 class TestCollectAllWithExisting:
     """Tests for the two-phase write with existing file comparison."""
 
-    def _make_api(self):
+    def _make_api(self, plan_rc, plan_none):
         return MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
         )
 
-    def test_no_existing_file_treated_as_changed(self, tmp_path):
+    def test_no_existing_file_treated_as_changed(self, tmp_path, plan_rc, plan_none):
         """Missing existing file → data_changed = True."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         result = collect_all(
             str(master_file), str(output_file),
             existing_path=str(tmp_path / "nonexistent.yaml"),
-            api=self._make_api(),
+            api=self._make_api(plan_rc, plan_none),
         )
         assert result.data_changed is True
 
-    def test_unchanged_carries_forward_last_updated(self, tmp_path):
+    def test_unchanged_carries_forward_last_updated(self, tmp_path, plan_rc, plan_none):
         """Same data → last_updated preserved from existing, data_changed = False."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
         existing_file = tmp_path / "existing.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         # First run: generate baseline
-        api1 = self._make_api()
+        api1 = self._make_api(plan_rc, plan_none)
         collect_all(str(master_file), str(output_file), api=api1)
 
         # Copy output as existing file
         existing_file.write_text(output_file.read_text())
-        original_output = yaml.safe_load(existing_file.read_text())
+        original_output = _load_yaml(existing_file)
         original_last_updated = original_output["metadata"]["last_updated"]
 
         # Second run: same data, with existing
-        api2 = self._make_api()
+        api2 = self._make_api(plan_rc, plan_none)
         result = collect_all(
             str(master_file), str(output_file),
             existing_path=str(existing_file),
@@ -588,23 +717,23 @@ class TestCollectAllWithExisting:
         # last_checked should be current (newer than last_updated)
         assert result.last_checked >= original_last_updated
 
-    def test_changed_data_updates_last_updated(self, tmp_path):
+    def test_changed_data_updates_last_updated(self, tmp_path, plan_rc, plan_none):
         """Different data → last_updated = last_checked, data_changed = True."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
         existing_file = tmp_path / "existing.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         # First run: generate baseline
-        api1 = self._make_api()
+        api1 = self._make_api(plan_rc, plan_none)
         collect_all(str(master_file), str(output_file), api=api1)
         existing_file.write_text(output_file.read_text())
 
         # Second run: different data (add snapshot branch → state change)
         api2 = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
             branches={"QualityOnDemand": ["release-snapshot/r4.1-abc123"]},
         )
@@ -617,15 +746,15 @@ class TestCollectAllWithExisting:
         assert result.data_changed is True
         assert result.last_updated == result.last_checked
 
-    def test_no_existing_path_always_changed(self, tmp_path):
+    def test_no_existing_path_always_changed(self, tmp_path, plan_rc, plan_none):
         """No existing_path argument → data_changed = True (default)."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         result = collect_all(
             str(master_file), str(output_file),
-            api=self._make_api(),
+            api=self._make_api(plan_rc, plan_none),
         )
         assert result.data_changed is True
 
@@ -642,17 +771,6 @@ PUBLIC_RELEASE = {
     "apis": [{"api_name": "quality-on-demand", "api_version": "1.0.0"}],
 }
 
-PLAN_NONE_FALL25 = yaml.dump({
-    "repository": {
-        "release_track": "meta-release",
-        "meta_release": "Fall25",
-        "target_release_tag": "r3.2",
-        "target_release_type": "none",
-    },
-    "apis": [{"api_name": "quality-on-demand", "target_api_version": "1.0.0",
-              "target_api_status": "stable"}],
-})
-
 HISTORICAL_MASTER = {
     "metadata": SAMPLE_MASTER["metadata"],
     "repositories": [
@@ -770,14 +888,14 @@ class TestCollectHistoricalEntries:
 
 
 class TestCollectAllWithHistorical:
-    def test_historical_entries_added_for_repos_without_plan(self, tmp_path):
+    def test_historical_entries_added_for_repos_without_plan(self, tmp_path, plan_none_fall25):
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(HISTORICAL_MASTER))
+        master_file.write_text(yaml.dump(HISTORICAL_MASTER, Dumper=SafeDumper))
 
         # Only QoD has a release-plan.yaml (with active plan)
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_NONE_FALL25},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_none_fall25},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
@@ -804,7 +922,7 @@ class TestCollectAllWithHistorical:
         }
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(master_with_independent))
+        master_file.write_text(yaml.dump(master_with_independent, Dumper=SafeDumper))
 
         api = MockGitHubAPI()  # No release-plan.yaml for IndependentRepo
         result = collect_all(str(master_file), str(output_file), api=api)
@@ -816,15 +934,15 @@ class TestCollectAllWithHistorical:
         assert e.release_track == "independent"
         assert e.meta_release is None
 
-    def test_active_plan_repo_not_duplicated_as_historical(self, tmp_path):
+    def test_active_plan_repo_not_duplicated_as_historical(self, tmp_path, plan_none_fall25):
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(HISTORICAL_MASTER))
+        master_file.write_text(yaml.dump(HISTORICAL_MASTER, Dumper=SafeDumper))
 
         # QoD has a plan → should appear once as NOT_PLANNED (target_release_type=none),
         # not again as HISTORICAL.
         api = MockGitHubAPI(
-            file_contents={"QualityOnDemand/release-plan.yaml": PLAN_NONE_FALL25},
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_none_fall25},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
@@ -836,63 +954,67 @@ class TestCollectAllWithHistorical:
 class TestKPIStatistics:
     """Test PA#198 KPI cascade statistics."""
 
-    def test_planned_with_caller_workflow_is_fully_onboarded(self, tmp_path):
+    def test_planned_with_caller_workflow_is_fully_onboarded(
+        self, tmp_path, plan_rc, plan_none
+    ):
         """PLANNED repo with caller workflow counts as fully onboarded."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
                 "QualityOnDemand/.github/workflows/release-automation.yml": "name: RA",
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
         )
         result = collect_all(str(master_file), str(output_file), api=api)
         assert result.collection_stats.repos_fully_onboarded == 1
 
-    def test_planned_without_caller_workflow_not_fully_onboarded(self, tmp_path):
+    def test_planned_without_caller_workflow_not_fully_onboarded(
+        self, tmp_path, plan_rc, plan_none
+    ):
         """PLANNED repo without caller workflow is not fully onboarded."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
         )
         result = collect_all(str(master_file), str(output_file), api=api)
         assert result.collection_stats.repos_fully_onboarded == 0
 
-    def test_snapshot_active_implies_fully_onboarded(self, tmp_path):
+    def test_snapshot_active_implies_fully_onboarded(self, tmp_path, plan_rc, plan_none):
         """SNAPSHOT_ACTIVE state implies caller workflow exists."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
             branches={"QualityOnDemand": ["release-snapshot/r4.1-abc123"]},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
         assert result.collection_stats.repos_fully_onboarded == 1
 
-    def test_release_issue_counted(self, tmp_path):
+    def test_release_issue_counted(self, tmp_path, plan_rc, plan_none):
         """Repos with release issues are counted."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
             release_issues={
                 "QualityOnDemand": {
@@ -906,20 +1028,20 @@ class TestKPIStatistics:
         result = collect_all(str(master_file), str(output_file), api=api)
         assert result.collection_stats.repos_with_release_issue == 1
 
-    def test_kpi_fields_in_metadata_output(self, tmp_path):
+    def test_kpi_fields_in_metadata_output(self, tmp_path, plan_rc, plan_none):
         """New KPI fields must appear in serialized metadata."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(SAMPLE_MASTER))
+        master_file.write_text(yaml.dump(SAMPLE_MASTER, Dumper=SafeDumper))
 
         api = MockGitHubAPI(
             file_contents={
-                "QualityOnDemand/release-plan.yaml": PLAN_RC,
-                "InactiveRepo/release-plan.yaml": PLAN_NONE,
+                "QualityOnDemand/release-plan.yaml": plan_rc,
+                "InactiveRepo/release-plan.yaml": plan_none,
             },
         )
         result = collect_all(str(master_file), str(output_file), api=api)
-        output = yaml.safe_load(output_file.read_text())
+        output = _load_yaml(output_file)
         meta = output["metadata"]
         assert "repos_fully_onboarded" in meta
         assert "repos_with_release_issue" in meta
@@ -999,13 +1121,13 @@ class TestExcludeArchivedAndSplit:
             ],
         }
 
-    def test_scanned_count_excludes_archived_and_split(self, tmp_path):
+    def test_scanned_count_excludes_archived_and_split(self, tmp_path, plan_rc):
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(self._master()))
+        master_file.write_text(yaml.dump(self._master(), Dumper=SafeDumper))
 
         api = MockGitHubAPI(
-            file_contents={"ActivePlanned/release-plan.yaml": PLAN_RC},
+            file_contents={"ActivePlanned/release-plan.yaml": plan_rc},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
@@ -1013,14 +1135,14 @@ class TestExcludeArchivedAndSplit:
         assert result.collection_stats.repos_scanned == 2
         assert result.collection_stats.repos_with_plan == 1
 
-    def test_brand_new_counted(self, tmp_path):
+    def test_brand_new_counted(self, tmp_path, plan_rc):
         """Active repos with no release and no plan count as 'new'."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(self._master()))
+        master_file.write_text(yaml.dump(self._master(), Dumper=SafeDumper))
 
         api = MockGitHubAPI(
-            file_contents={"ActivePlanned/release-plan.yaml": PLAN_RC},
+            file_contents={"ActivePlanned/release-plan.yaml": plan_rc},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
@@ -1029,14 +1151,14 @@ class TestExcludeArchivedAndSplit:
         # Archived/split repos are filtered out entirely
         assert result.collection_stats.repos_new == 1
 
-    def test_historical_releases_preserved_for_excluded_repos(self, tmp_path):
+    def test_historical_releases_preserved_for_excluded_repos(self, tmp_path, plan_rc):
         """Archived and split repos still contribute historical entries."""
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(self._master()))
+        master_file.write_text(yaml.dump(self._master(), Dumper=SafeDumper))
 
         api = MockGitHubAPI(
-            file_contents={"ActivePlanned/release-plan.yaml": PLAN_RC},
+            file_contents={"ActivePlanned/release-plan.yaml": plan_rc},
         )
         result = collect_all(str(master_file), str(output_file), api=api)
 
@@ -1055,18 +1177,62 @@ class TestExcludeArchivedAndSplit:
         )
         assert split_entry.state == ProgressState.HISTORICAL
 
-    def test_repos_new_in_serialized_metadata(self, tmp_path):
+    def test_repos_new_in_serialized_metadata(self, tmp_path, plan_rc):
         master_file = tmp_path / "releases-master.yaml"
         output_file = tmp_path / "releases-progress.yaml"
-        master_file.write_text(yaml.dump(self._master()))
+        master_file.write_text(yaml.dump(self._master(), Dumper=SafeDumper))
 
         api = MockGitHubAPI(
-            file_contents={"ActivePlanned/release-plan.yaml": PLAN_RC},
+            file_contents={"ActivePlanned/release-plan.yaml": plan_rc},
         )
         collect_all(str(master_file), str(output_file), api=api)
 
-        output = yaml.safe_load(output_file.read_text())
+        output = _load_yaml(output_file)
         meta = output["metadata"]
         assert meta["repos_scanned"] == 2
         assert meta["repos_new"] == 1
         assert isinstance(meta["repos_new"], int)
+
+
+class TestOutputFormat:
+    def _collect(self, tmp_path, plan, output_name, **kwargs):
+        master_file = tmp_path / "releases-master.yaml"
+        master_file.write_text(yaml.dump(HISTORICAL_MASTER, Dumper=SafeDumper))
+        api = MockGitHubAPI(
+            file_contents={"QualityOnDemand/release-plan.yaml": plan},
+        )
+        output_file = tmp_path / output_name
+        collect_all(str(master_file), str(output_file), api=api, **kwargs)
+        return output_file
+
+    def test_json_output_matches_yaml(self, tmp_path, plan_none_fall25):
+        yaml_file = self._collect(
+            tmp_path, plan_none_fall25, "releases-progress.yaml",
+            json_output_path=str(tmp_path / "releases-progress.json"),
+        )
+        from_yaml = _load_yaml(yaml_file)
+        from_json = json.loads((tmp_path / "releases-progress.json").read_text())
+        assert from_json == from_yaml
+
+    def test_jsonl_output_has_one_entry_per_line(self, tmp_path, plan_none_fall25):
+        yaml_file = self._collect(
+            tmp_path, plan_none_fall25, "releases-progress.yaml",
+            jsonl_output_path=str(tmp_path / "releases-progress.jsonl"),
+        )
+        lines = (tmp_path / "releases-progress.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == _load_yaml(yaml_file)["progress"]
+
+    def test_json_existing_file_used_for_comparison(self, tmp_path, plan_none_fall25):
+        first = self._collect(tmp_path, plan_none_fall25, "first.json")
+        existing = json.loads(first.read_text())
+
+        master_file = tmp_path / "releases-master.yaml"
+        api = MockGitHubAPI(
+            file_contents={"QualityOnDemand/release-plan.yaml": plan_none_fall25},
+        )
+        result = collect_all(
+            str(master_file), str(tmp_path / "second.json"),
+            existing_path=str(first), api=api,
+        )
+        assert result.data_changed is False
+        assert result.last_updated == existing["metadata"]["last_updated"]
@@ -0,0 +1,48 @@
+"""Tests for progress viewer generation."""
+
+import base64
+import gzip
+import json
+
+from scripts import generate_progress_viewer as viewer
+
+
+class TestRenderTemplate:
+    def test_substitutes_every_placeholder(self):
+        template = "<style>{{VIEWER_STYLES}}</style>{{VIEWER_LIBRARY}};{{PROGRESS_DATA}}|{{PROGRESS_DATA}}"
+        html = viewer._render_template(template, {
+            "VIEWER_STYLES": "css", "VIEWER_LIBRARY": "lib", "PROGRESS_DATA": "{}",
+        })
+        assert html == "<style>css</style>lib;{}|{}"
+
+    def test_inserted_content_not_rescanned(self):
+        html = viewer._render_template("{{VIEWER_LIBRARY}}{{PROGRESS_DATA}}", {
+            "VIEWER_STYLES": "", "VIEWER_LIBRARY": "x = '{{PROGRESS_DATA}}'",
+            "PROGRESS_DATA": "{}",
+        })
+        assert html == "x = '{{PROGRESS_DATA}}'{}"
+
+
+class TestGenerateViewer:
+    def _generate(self, tmp_path, **kwargs):
+        data_file = tmp_path / "releases-progress.json"
+        data_file.write_text(json.dumps({"metadata": {}, "progress": []}))
+        template = tmp_path / "template.html"
+        template.write_text("{{VIEWER_STYLES}}|{{VIEWER_LIBRARY}}|{{PROGRESS_DATA}}")
+        (tmp_path / "viewer-styles.css").write_text("css")
+        (tmp_path / "viewer-lib.js").write_text("lib")
+        output = tmp_path / "out.html"
+        viewer.generate_viewer(
+            str(data_file), str(output), template_path=str(template),
+            shared_assets_dir=str(tmp_path), **kwargs,
+        )
+        return output.read_text().split("|")[2]
+
+    def test_data_embedded_as_gzip_base64_by_default(self, tmp_path):
+        payload = json.loads(self._generate(tmp_path))
+        data = json.loads(gzip.decompress(base64.b64decode(payload)))
+        assert data == {"metadata": {}, "progress": []}
+
+    def test_no_compress_embeds_json_literal(self, tmp_path):
+        payload = self._generate(tmp_path, compress=False)
+        assert json.loads(payload) == {"metadata": {}, "progress": []}
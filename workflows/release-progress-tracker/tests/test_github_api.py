@@ -1,20 +1,32 @@
 """Tests for GitHub API client fallback behavior."""
 
+import base64
+import json
+import time
+
 import pytest
 import requests
 
+from scripts import github_api
 from scripts.github_api import GitHubAPI, RateLimitError, RETRY_ATTEMPTS
 
 
 class FakeResponse:
-    def __init__(self, status_code, payload, rate_limit_remaining="100"):
+    def __init__(self, status_code, payload, rate_limit_remaining="100", headers=None,
+                 links=None):
         self.status_code = status_code
         self._payload = payload
+        self.links = links or {}
         self.headers = {"X-RateLimit-Remaining": rate_limit_remaining}
+        self.headers.update(headers or {})
 
     def json(self):
         return self._payload
 
+    @property
+    def text(self):
+        return json.dumps(self._payload)
+
     def raise_for_status(self):
         if self.status_code >= 400:
             raise RuntimeError(f"HTTP {self.status_code}")
@@ -144,3 +156,497 @@ def test_request_raises_rate_limit_immediately_no_retry():
     with pytest.raises(RateLimitError):
         api._get("/some/path")
     assert api.api_calls == 1
+
+
+# Secondary rate limits ---------------------------------------------------------
+
+
+def test_request_waits_out_secondary_rate_limit():
+    sleeps = []
+    api = _api_with_session([
+        FakeResponse(403, None, headers={"Retry-After": "7"}),
+        FakeResponse(200, {"ok": True}),
+    ])
+    api._sleep = sleeps.append
+    resp = api._get("/some/path")
+    assert resp.status_code == 200
+    assert sleeps == [7]
+
+
+def test_request_retries_429_without_retry_after():
+    api = _api_with_session([
+        FakeResponse(429, None),
+        FakeResponse(200, {"ok": True}),
+    ])
+    resp = api._get("/some/path")
+    assert resp.status_code == 200
+    assert api.api_calls == 2
+
+
+def test_request_no_retry_on_plain_403():
+    """A 403 without Retry-After is a permission error, not a rate limit."""
+    api = _api_with_session([FakeResponse(403, None)])
+    resp = api._get("/forbidden")
+    assert resp.status_code == 403
+    assert api.api_calls == 1
+
+
+# GraphQL repo bundle -----------------------------------------------------------
+
+
+def _bundle_payload(**overrides):
+    repository = {
+        "plan": {"text": "repository:\n  target_release_tag: r4.1\n"},
+        "callerWorkflow": None,
+        "snapshots": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [{"name": "r4.1-abc123"}],
+        },
+        "tags": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [{"name": "r3.2"}],
+        },
+        "releases": {"nodes": [{"isDraft": False}]},
+        "issues": {"pageInfo": {"hasNextPage": False}, "nodes": [{
+            "number": 7,
+            "url": "https://github.com/camaraproject/ReleaseTest/issues/7",
+            "body": (
+                "<!-- release-automation:workflow-owned -->\n"
+                "<!-- release-automation:release-tag:r4.1 -->"
+            ),
+            "labels": {"nodes": [{"name": "release-issue"}]},
+        }]},
+    }
+    repository.update(overrides)
+    return {"data": {"repository": repository}}
+
+
+def test_repo_bundle_serves_artifact_lookups_without_rest_calls():
+    api = _api_with_session([FakeResponse(200, _bundle_payload())])
+
+    assert api.fetch_repo_bundle("ReleaseTest") is not None
+    # ScriptedSession fails on any further request.
+    assert api.get_file_content("ReleaseTest", "release-plan.yaml").startswith("repository:")
+    assert api.get_file_content(
+        "ReleaseTest", ".github/workflows/release-automation.yml"
+    ) is None
+    assert api.list_branches("ReleaseTest", prefix="release-snapshot/") == [
+        "release-snapshot/r4.1-abc123"
+    ]
+    assert api.tag_exists("ReleaseTest", "r3.2") is True
+    assert api.tag_exists("ReleaseTest", "r4.1") is False
+    assert api.get_draft_releases("ReleaseTest") == []
+    assert api.find_release_issue("ReleaseTest", "r4.1")["number"] == 7
+    assert api.api_calls == 1
+
+
+def test_repo_bundle_falls_back_to_rest_for_truncated_issues():
+    marker = "<!-- release-automation:workflow-owned -->\n"
+    stale = {
+        "number": 3,
+        "url": "https://github.com/camaraproject/ReleaseTest/issues/3",
+        "body": marker + "<!-- release-automation:release-tag:r4.1 -->",
+        "labels": {"nodes": [{"name": "release-issue"}]},
+    }
+    payload = _bundle_payload(issues={
+        "pageInfo": {"hasNextPage": True},
+        "nodes": [stale],
+    })
+    newest = {
+        "number": 51,
+        "html_url": "https://github.com/camaraproject/ReleaseTest/issues/51",
+        "body": marker + "<!-- release-automation:release-tag:r4.1 -->",
+        "labels": [{"name": "release-issue"}],
+    }
+    api = _api_with_session([
+        FakeResponse(200, payload),
+        FakeResponse(200, [newest, {**newest, "number": 3}]),
+    ])
+    api.fetch_repo_bundle("ReleaseTest")
+
+    assert "orderBy: {field: CREATED_AT, direction: DESC}" in github_api.REPO_BUNDLE_FRAGMENT
+    assert api.find_release_issue("ReleaseTest", "r4.1")["number"] == 51
+    assert api.api_calls == 2
+
+
+def test_repo_bundle_falls_back_to_rest_for_truncated_refs():
+    payload = _bundle_payload(tags={
+        "pageInfo": {"hasNextPage": True},
+        "nodes": [{"name": "r3.2"}],
+    })
+    api = _api_with_session([
+        FakeResponse(200, payload),
+        FakeResponse(200, {"ref": "refs/tags/r1.1"}),
+    ])
+    api.fetch_repo_bundle("ReleaseTest")
+
+    assert api.tag_exists("ReleaseTest", "r1.1") is True
+    assert api.api_calls == 2
+
+
+def test_repo_bundle_errors_leave_rest_path_in_place():
+    api = _api_with_session([
+        FakeResponse(200, {"data": {"repository": None},
+                           "errors": [{"type": "NOT_FOUND"}]}),
+    ])
+    assert api.fetch_repo_bundle("Missing") is None
+    assert api._bundles == {}
+
+
+def test_repo_bundle_skipped_without_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    api = GitHubAPI(sleep=lambda _s: None)
+    assert api.fetch_repo_bundle("ReleaseTest") is None
+    assert api.api_calls == 0
+
+
+def _batch_payload(*repositories, errors=None):
+    payload = {"data": {
+        f"r{i}": repo for i, repo in enumerate(repositories)
+    }}
+    if errors:
+        payload["errors"] = errors
+    return payload
+
+
+def test_prefetch_batches_repos_into_one_query():
+    repository = _bundle_payload()["data"]["repository"]
+    api = _api_with_session([FakeResponse(200, _batch_payload(repository, repository))])
+
+    assert api.prefetch_repo_bundles(["RepoA", "RepoB"]) == 2
+    assert api.api_calls == 1
+    # Served from the prefetched bundles; ScriptedSession fails on any request.
+    assert api.fetch_repo_bundle("RepoB") is not None
+    assert api.tag_exists("RepoA", "r3.2") is True
+    assert api.api_calls == 1
+
+
+def test_prefetch_splits_large_repo_lists(monkeypatch):
+    monkeypatch.setattr(github_api, "BUNDLE_BATCH_SIZE", 2)
+    repository = _bundle_payload()["data"]["repository"]
+    api = _api_with_session([
+        FakeResponse(200, _batch_payload(repository, repository)),
+        FakeResponse(200, _batch_payload(repository)),
+    ])
+
+    assert api.prefetch_repo_bundles(["RepoA", "RepoB", "RepoC"]) == 3
+    assert api.api_calls == 2
+
+
+def test_prefetch_skips_errored_aliases():
+    repository = _bundle_payload()["data"]["repository"]
+    api = _api_with_session([
+        FakeResponse(200, _batch_payload(
+            repository, None,
+            errors=[{"type": "NOT_FOUND", "path": ["r1"]}],
+        )),
+    ])
+
+    assert api.prefetch_repo_bundles(["RepoA", "Missing"]) == 1
+    assert set(api._bundles) == {"RepoA"}
+
+
+def test_prefetch_skipped_without_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+    api = GitHubAPI(sleep=lambda _s: None)
+    assert api.prefetch_repo_bundles(["RepoA"]) == 0
+    assert api.api_calls == 0
+
+
+# Conditional-GET cache ---------------------------------------------------------
+
+
+class RecordingSession(ScriptedSession):
+    def __init__(self, script):
+        super().__init__(script)
+        self.sent_headers = []
+
+    def request(self, method, url, **kwargs):
+        self.sent_headers.append(dict(kwargs.get("headers") or {}))
+        return super().request(method, url, **kwargs)
+
+
+def test_etag_cache_replays_body_on_304_across_runs(tmp_path):
+    first = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    first.session = first.public_session = RecordingSession([
+        FakeResponse(200, [{"name": "main"}], headers={"ETag": '"abc"'}),
+    ])
+    assert first._get("/repos/camaraproject/X/branches").json() == [{"name": "main"}]
+    first.save_cache()
+
+    second = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    session = RecordingSession([FakeResponse(304, None)])
+    second.session = second.public_session = session
+    resp = second._get("/repos/camaraproject/X/branches")
+
+    assert session.sent_headers[0]["If-None-Match"] == '"abc"'
+    assert resp.status_code == 200
+    assert resp.json() == [{"name": "main"}]
+    # 304s do not count against the primary rate limit.
+    assert second.api_calls == 0
+    assert second.not_modified == 1
+
+
+def test_save_cache_prunes_etag_entries_unused_this_run(tmp_path):
+    first = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    first.session = first.public_session = RecordingSession([
+        FakeResponse(200, [], headers={"ETag": '"a"'}),
+        FakeResponse(200, [], headers={"ETag": '"b"'}),
+    ])
+    first._get("/repos/camaraproject/A/branches")
+    first._get("/repos/camaraproject/B/branches")
+    first.save_cache()
+
+    second = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    second.session = second.public_session = RecordingSession([FakeResponse(304, None)])
+    second._get("/repos/camaraproject/A/branches")
+    second.save_cache()
+
+    saved = json.loads((tmp_path / github_api.ETAG_CACHE_FILE).read_text())
+    assert [json.loads(key)[0].rsplit("/", 2)[-2] for key in saved] == ["A"]
+
+
+def test_etag_cache_disabled_without_cache_dir():
+    session = RecordingSession([
+        FakeResponse(200, [], headers={"ETag": '"abc"'}),
+        FakeResponse(200, []),
+    ])
+    api = GitHubAPI(token="test-token", sleep=lambda _s: None)
+    api.session = api.public_session = session
+    api._get("/path")
+    api.clear_memo()
+    api._get("/path")
+    assert "If-None-Match" not in session.sent_headers[1]
+
+
+def _contents_response(text):
+    return FakeResponse(200, {
+        "encoding": "base64",
+        "content": base64.b64encode(text.encode("utf-8")).decode("ascii"),
+    })
+
+
+def test_tag_file_content_cached_across_runs(tmp_path):
+    first = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    first.session = ScriptedSession([_contents_response("apis: []\n")])
+    assert first.get_tag_file_content("X", "release-metadata.yaml", "r1.2") == "apis: []\n"
+    first.save_cache()
+
+    second = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    second.session = ScriptedSession([])  # any request would fail
+    assert second.get_tag_file_content("X", "release-metadata.yaml", "r1.2") == "apis: []\n"
+    assert second.api_calls == 0
+
+
+def test_save_cache_prunes_tag_files_unused_this_run(tmp_path):
+    first = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    first.session = ScriptedSession([
+        _contents_response("apis: []\n"), _contents_response("apis: []\n"),
+    ])
+    first.get_tag_file_content("X", "release-metadata.yaml", "r1.2")
+    first.get_tag_file_content("X", "release-metadata.yaml", "r1.3")
+    first.save_cache()
+
+    second = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    second.session = ScriptedSession([])
+    second.get_tag_file_content("X", "release-metadata.yaml", "r1.3")
+    second.save_cache()
+
+    saved = json.loads((tmp_path / github_api.TAG_FILE_CACHE_FILE).read_text())
+    assert list(saved) == ["X@r1.3:release-metadata.yaml"]
+
+
+def test_tag_file_missing_is_not_cached(tmp_path):
+    api = GitHubAPI(token="test-token", sleep=lambda _s: None, cache_dir=str(tmp_path))
+    api.session = ScriptedSession([FakeResponse(404, None)])
+    assert api.get_tag_file_content("X", "release-metadata.yaml", "r1.2") is None
+    assert api._tag_file_cache == {}
+
+
+# Branch listing ----------------------------------------------------------------
+
+
+def test_list_branches_with_prefix_uses_matching_refs(monkeypatch):
+    api = GitHubAPI(token="test-token")
+    paths = []
+
+    def fake_get(path, public=False, **kwargs):
+        paths.append(path)
+        return FakeResponse(200, [
+            {"ref": "refs/heads/release-snapshot/r4.1-abc123"},
+            {"ref": "refs/heads/release-snapshot/r4.2-def456"},
+        ])
+
+    monkeypatch.setattr(api, "_get", fake_get)
+
+    branches = api.list_branches("ReleaseTest", prefix="release-snapshot/")
+
+    assert paths == [
+        "/repos/camaraproject/ReleaseTest/git/matching-refs/heads/release-snapshot/"
+    ]
+    assert branches == [
+        "release-snapshot/r4.1-abc123",
+        "release-snapshot/r4.2-def456",
+    ]
+
+
+def test_sessions_share_sized_keepalive_pool():
+    api = GitHubAPI(token="test-token")
+    for session in (api.session, api.public_session):
+        adapter = session.get_adapter("https://api.github.com/")
+        assert adapter._pool_maxsize == github_api.HTTP_POOL_SIZE
+        assert "gzip" in session.headers["Accept-Encoding"]
+
+
+def test_requests_carry_default_timeout():
+    seen = {}
+
+    class TimeoutSession(ScriptedSession):
+        def request(self, method, url, **kwargs):
+            seen["timeout"] = kwargs.get("timeout")
+            return super().request(method, url, **kwargs)
+
+    api = GitHubAPI(token="test-token", sleep=lambda _s: None)
+    api.session = TimeoutSession([FakeResponse(200, {})])
+    api._get("/repos/x/y")
+    assert seen["timeout"] == github_api.REQUEST_TIMEOUT_SECONDS
+
+
+# In-run memo -------------------------------------------------------------------
+
+
+def test_repeated_get_is_memoized():
+    api = _api_with_session([FakeResponse(200, ["a"]), FakeResponse(200, ["b"])])
+    assert api._get("/p", params={"per_page": 1}).json() == ["a"]
+    assert api._get("/p", params={"per_page": 1}).json() == ["a"]
+    assert api.session.calls == 1
+    # Different params are a different request.
+    assert api._get("/p", params={"per_page": 2}).json() == ["b"]
+
+
+def test_memo_skips_errors_and_expires(monkeypatch):
+    api = _api_with_session([
+        FakeResponse(404, None), FakeResponse(200, ["a"]), FakeResponse(200, ["b"]),
+    ])
+    assert api._get("/p").status_code == 404
+    assert api._get("/p").json() == ["a"]
+    clock = time.monotonic() + github_api.MEMO_TTL_SECONDS + 1
+    monkeypatch.setattr(github_api.time, "monotonic", lambda: clock)
+    assert api._get("/p").json() == ["b"]
+
+
+def test_list_branches_follows_link_header():
+    api = _api_with_session([
+        FakeResponse(200, [{"name": f"b{i}"} for i in range(100)], links={
+            "next": {"url": "https://api.github.com/repositories/1/branches?per_page=100&page=2"},
+        }),
+        FakeResponse(200, [{"name": "last"}]),
+    ])
+    branches = api.list_branches("ReleaseTest")
+    assert len(branches) == 101
+    assert branches[-1] == "last"
+    # No trailing request for an empty page.
+    assert api.session.calls == 2
+
+
+# Token pool ------------------------------------------------------------------
+
+
+class AuthRecordingSession(ScriptedSession):
+    """ScriptedSession that records the Authorization header of each call."""
+
+    def __init__(self, script):
+        super().__init__(script)
+        self.auth = []
+
+    def request(self, method, url, **kwargs):
+        self.auth.append((kwargs.get("headers") or {}).get("Authorization"))
+        return super().request(method, url, **kwargs)
+
+
+def _pooled_api(tokens, script):
+    api = GitHubAPI(tokens=tokens, sleep=lambda _s: None)
+    api.session = AuthRecordingSession(script)
+    return api
+
+
+def test_token_pool_read_from_env(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKENS", "a, b,,c")
+    monkeypatch.setenv("GITHUB_TOKEN", "single")
+    assert GitHubAPI()._tokens == ["a", "b", "c"]
+    monkeypatch.delenv("GITHUB_TOKENS")
+    assert GitHubAPI()._tokens == ["single"]
+
+
+def test_token_pool_rotates_round_robin():
+    api = _pooled_api(["a", "b"], [FakeResponse(200, {})] * 3)
+    for n in range(3):
+        api._get(f"/repos/x/y{n}")
+    assert api.session.auth == ["token a", "token b", "token a"]
+
+
+def test_exhausted_token_rotates_to_next():
+    api = _pooled_api(["a", "b"], [
+        FakeResponse(200, {"last": True},
+                     headers={"X-RateLimit-Remaining": "0",
+                              "X-RateLimit-Reset": str(time.time() + 600)}),
+        FakeResponse(200, {"ok": True}),
+        FakeResponse(200, {"ok": True}),
+    ])
+    # The call that spent the last unit of budget still succeeded.
+    assert api._get("/repos/x/y").json() == {"last": True}
+    assert api._get("/repos/x/z").json() == {"ok": True}
+    assert api._get("/repos/x/w").json() == {"ok": True}
+    # Token "a" stays parked until its reset time.
+    assert api.session.auth == ["token a", "token b", "token b"]
+
+
+def test_rejected_request_retried_on_next_token():
+    api = _pooled_api(["a", "b"], [
+        FakeResponse(403, {}, headers={"X-RateLimit-Remaining": "0",
+                                       "X-RateLimit-Reset": str(time.time() + 600)}),
+        FakeResponse(200, {"ok": True}),
+    ])
+    assert api._get("/repos/x/y").json() == {"ok": True}
+    assert api.session.auth == ["token a", "token b"]
+
+
+def test_stale_reset_time_does_not_loop_on_exhausted_token():
+    stale = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}
+    api = _pooled_api(["a", "b"], [
+        FakeResponse(403, {}, headers=stale),
+        FakeResponse(403, {}, headers=stale),
+    ])
+    with pytest.raises(RateLimitError):
+        api._get("/repos/x/y")
+    assert api.session.auth == ["token a", "token b"]
+
+
+def test_exhausted_core_budget_leaves_graphql_on_same_token():
+    api = _pooled_api(["a", "b"], [
+        FakeResponse(200, {}, headers={"X-RateLimit-Remaining": "0",
+                                       "X-RateLimit-Resource": "core",
+                                       "X-RateLimit-Reset": str(time.time() + 600)}),
+        FakeResponse(200, {"data": {}}),
+        FakeResponse(200, {"data": {}}),
+    ])
+    api._get("/repos/x/y")
+    api._request("POST", github_api.GRAPHQL_URL, json={})
+    api._request("POST", github_api.GRAPHQL_URL, json={})
+    assert api.session.auth == ["token a", "token b", "token a"]
+
+
+def test_rate_limit_error_when_all_tokens_exhausted():
+    exhausted = {"X-RateLimit-Remaining": "0",
+                 "X-RateLimit-Reset": str(time.time() + 600)}
+    api = _pooled_api(["a", "b"], [
+        FakeResponse(200, {}, headers=exhausted),
+        FakeResponse(200, {}, headers=exhausted),
+    ])
+    api._get("/repos/x/y")
+    api._get("/repos/x/z")
+    with pytest.raises(RateLimitError):
+        api._get("/repos/x/w")
+    assert api.session.calls == 2
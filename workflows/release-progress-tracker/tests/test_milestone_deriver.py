@@ -1,8 +1,11 @@
 """Tests for M1/M3/M4 milestone derivation."""
 
+import random
+
 import pytest
 
 from scripts.milestone_deriver import (
+    build_milestone_index,
     derive_cycle_releases,
     derive_last_published,
     build_meta_release_summaries,
@@ -58,52 +61,51 @@ SAMPLE_RELEASES = [
 ]
 
 
+@pytest.fixture(scope="session")
+def sample_releases():
+    return SAMPLE_RELEASES
+
+
+@pytest.fixture(scope="session")
+def qod_cycle(sample_releases):
+    """QualityOnDemand r4.x in Sync26, derived once and shared read-only."""
+    return derive_cycle_releases(
+        "QualityOnDemand", "r4.1", "Sync26", sample_releases,
+    )
+
+
 class TestDeriveCycleReleases:
     """Test M1/M3/M4 derivation from releases."""
 
-    def test_m1_alpha_detected(self):
-        cr = derive_cycle_releases(
-            "QualityOnDemand", "r4.1", "Sync26", SAMPLE_RELEASES,
-        )
-        assert cr.m1 is not None
-        assert cr.m1.release_tag == "r4.1"
-        assert cr.m1.release_date == "2026-02-10T14:30:00Z"
-        assert cr.m1.apis[0].api_version == "1.2.0-alpha.1"
+    def test_m1_alpha_detected(self, qod_cycle):
+        assert qod_cycle.m1 is not None
+        assert qod_cycle.m1.release_tag == "r4.1"
+        assert qod_cycle.m1.release_date == "2026-02-10T14:30:00Z"
+        assert qod_cycle.m1.apis[0].api_version == "1.2.0-alpha.1"
 
-    def test_m3_rc_detected(self):
-        cr = derive_cycle_releases(
-            "QualityOnDemand", "r4.1", "Sync26", SAMPLE_RELEASES,
-        )
-        assert cr.m3 is not None
-        assert cr.m3.release_tag == "r4.2"
+    def test_m3_rc_detected(self, qod_cycle):
+        assert qod_cycle.m3 is not None
+        assert qod_cycle.m3.release_tag == "r4.2"
 
-    def test_m4_not_achieved(self):
-        cr = derive_cycle_releases(
-            "QualityOnDemand", "r4.1", "Sync26", SAMPLE_RELEASES,
-        )
-        assert cr.m4 is not None
-        assert cr.m4.release_tag is None
-        assert cr.m4.apis == []  # Unachieved milestone has no API entries
+    def test_m4_not_achieved(self, qod_cycle):
+        assert qod_cycle.m4 is not None
+        assert qod_cycle.m4.release_tag is None
+        assert qod_cycle.m4.apis == []  # Unachieved milestone has no API entries
 
-    def test_filters_by_repo_and_tag_prefix(self):
+    def test_filters_by_repo_and_tag_prefix(self, qod_cycle):
         """Should not include DeviceLocation releases for QualityOnDemand."""
-        cr = derive_cycle_releases(
-            "QualityOnDemand", "r4.1", "Sync26", SAMPLE_RELEASES,
-        )
         # M1 should be QoD's alpha, not DeviceLocation's
-        assert cr.m1.release_tag == "r4.1"
+        assert qod_cycle.m1.release_tag == "r4.1"
 
-    def test_different_tag_prefix_excluded(self):
+    def test_different_tag_prefix_excluded(self, qod_cycle):
         """Releases with different tag prefix should not appear in cycle."""
-        cr = derive_cycle_releases(
-            "QualityOnDemand", "r4.1", "Sync26", SAMPLE_RELEASES,
-        )
         # M4 should be unachieved (r3.5 has different prefix r3.)
-        assert cr.m4.release_tag is None
+        assert qod_cycle.m4.release_tag is None
 
-    def test_earliest_by_date(self):
+    @pytest.mark.parametrize("order", ["sorted", "reversed", "shuffled"])
+    def test_earliest_by_date(self, sample_releases, order):
         """When multiple alphas exist, should pick earliest by date."""
-        releases = SAMPLE_RELEASES + [{
+        releases = sample_releases + [{
             "repository": "QualityOnDemand",
             "release_tag": "r4.0",
             "release_date": "2026-01-05T08:00:00Z",
@@ -111,10 +113,13 @@ class TestDeriveCycleReleases:
             "release_type": "pre-release-alpha",
             "apis": [{"api_name": "quality-on-demand", "api_version": "1.2.0-alpha.0"}],
         }]
+        releases.sort(key=lambda r: r["release_date"], reverse=order == "reversed")
+        if order == "shuffled":
+            random.Random(0).shuffle(releases)
         cr = derive_cycle_releases(
             "QualityOnDemand", "r4.1", "Sync26", releases,
         )
-        assert cr.m1.release_tag == "r4.0"  # Earlier date
+        assert cr.m1.release_tag == "r4.0"  # Earlier date, whatever the input order
 
     def test_no_releases_returns_empty_milestones(self):
         cr = derive_cycle_releases(
@@ -206,6 +211,74 @@ class TestDeriveCycleReleases:
         assert cr.m1.apis[0].api_name == "original-api"
 
 
+class TestMilestoneIndex:
+    """Indexed milestone lookup must match the scanning path."""
+
+    @pytest.mark.parametrize("repo,tag", [
+        ("QualityOnDemand", "r4.1"),
+        ("QualityOnDemand", "r3.1"),
+        ("DeviceLocation", "r5.1"),
+        ("NewRepo", "r1.1"),
+    ])
+    def test_index_matches_scan(self, repo, tag):
+        index = build_milestone_index(SAMPLE_RELEASES)
+        scanned = derive_cycle_releases(repo, tag, "Sync26", SAMPLE_RELEASES)
+        indexed = derive_cycle_releases(
+            repo, tag, "Sync26", SAMPLE_RELEASES, milestone_index=index,
+        )
+        assert indexed == scanned
+
+    def test_index_matches_scan_on_generated_releases(self):
+        """Many repos and cycles in random order, including date ties."""
+        rng = random.Random(0)
+        release_types = ["pre-release-alpha", "pre-release-rc", "public-release",
+                         "maintenance-release"]
+        releases = [
+            {
+                "repository": f"Repo{repo}",
+                "release_tag": f"r{major}.{minor}",
+                "release_date": f"2026-{rng.randint(1, 12):02d}-01T00:00:00Z",
+                "release_type": rng.choice(release_types),
+                "apis": [{"api_name": f"api-{repo}", "api_version": f"{major}.{minor}.0"}],
+            }
+            for repo in range(20)
+            for major in range(1, 12)
+            for minor in range(1, 4)
+        ]
+        rng.shuffle(releases)
+        index = build_milestone_index(releases)
+        for release in releases:
+            repo, tag = release["repository"], release["release_tag"]
+            assert derive_cycle_releases(
+                repo, tag, None, releases, milestone_index=index,
+            ) == derive_cycle_releases(repo, tag, None, releases)
+
+    def test_index_keeps_earliest_by_date(self):
+        releases = SAMPLE_RELEASES + [{
+            "repository": "QualityOnDemand",
+            "release_tag": "r4.0",
+            "release_date": "2026-01-05T08:00:00Z",
+            "release_type": "pre-release-alpha",
+            "apis": [],
+        }]
+        index = build_milestone_index(releases)
+        assert index[("QualityOnDemand", "r4.", "pre-release-alpha")]["release_tag"] == "r4.0"
+
+    def test_index_does_not_mix_double_digit_prefixes(self):
+        releases = [{
+            "repository": "TestRepo",
+            "release_tag": "r10.1",
+            "release_date": "2026-01-05T08:00:00Z",
+            "release_type": "pre-release-alpha",
+            "apis": [],
+        }]
+        index = build_milestone_index(releases)
+        cr = derive_cycle_releases(
+            "TestRepo", "r1.1", None, releases, milestone_index=index,
+        )
+        assert cr.m1.release_tag is None
+
+
 class TestGetTagPrefix:
     """Test tag prefix extraction helper."""
 
@@ -1,7 +1,11 @@
 """Tests for data model serialization."""
 
-import yaml
+import dataclasses
+from datetime import datetime, timezone
 
+import pytest
+
+from scripts import models
 from scripts.models import (
     ApiEntry,
     ArtifactInfo,
@@ -27,6 +31,11 @@ class TestProgressWarning:
             "severity": "warning",
         }
 
+    def test_is_frozen(self):
+        w = ProgressWarning("W001", "test message", "warning")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            w.code = "W002"
+
 
 class TestApiEntry:
     def test_to_dict_with_contacts(self):
@@ -73,25 +82,29 @@ class TestCycleReleases:
         assert "m3" not in d
 
 
+def _full_entry():
+    """Entry with every optional section populated."""
+    return ProgressEntry(
+        repository="QualityOnDemand",
+        github_url="https://github.com/camaraproject/QualityOnDemand",
+        release_track="meta-release",
+        meta_release="Sync26",
+        target_release_tag="r4.2",
+        target_release_type="pre-release-rc",
+        apis=[ApiEntry("quality-on-demand", "1.2.0", "rc")],
+        state=ProgressState.SNAPSHOT_ACTIVE,
+        artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.2-abc"),
+        published_context=PublishedContext("r3.2", "r4.1"),
+        last_published=MilestoneRelease("r4.1", "2026-02-10T14:30:00Z",
+            [CycleReleaseApi("quality-on-demand", "1.2.0-alpha.1")]),
+        snapshot_api_versions={"quality-on-demand": "1.2.0-rc.1"},
+        warnings=[ProgressWarning("W001", "test", "warning")],
+    )
+
+
 class TestProgressEntry:
-    def test_full_serialization_round_trip(self):
-        entry = ProgressEntry(
-            repository="QualityOnDemand",
-            github_url="https://github.com/camaraproject/QualityOnDemand",
-            release_track="meta-release",
-            meta_release="Sync26",
-            target_release_tag="r4.2",
-            target_release_type="pre-release-rc",
-            apis=[ApiEntry("quality-on-demand", "1.2.0", "rc")],
-            state=ProgressState.SNAPSHOT_ACTIVE,
-            artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.2-abc"),
-            published_context=PublishedContext("r3.2", "r4.1"),
-            last_published=MilestoneRelease("r4.1", "2026-02-10T14:30:00Z",
-                [CycleReleaseApi("quality-on-demand", "1.2.0-alpha.1")]),
-            snapshot_api_versions={"quality-on-demand": "1.2.0-rc.1"},
-            warnings=[ProgressWarning("W001", "test", "warning")],
-        )
-        d = entry.to_dict()
+    def test_full_serialization(self):
+        d = _full_entry().to_dict()
 
         assert d["repository"] == "QualityOnDemand"
         assert d["state"] == "snapshot_active"
@@ -102,14 +115,6 @@ class TestProgressEntry:
         assert len(d["warnings"]) == 1
         assert d["warnings"][0]["code"] == "W001"
 
-        # Verify YAML serializable
-        yaml_str = yaml.dump(d, default_flow_style=False)
-        reloaded = yaml.safe_load(yaml_str)
-        assert reloaded["state"] == "snapshot_active"
-        assert reloaded["last_published"]["release_tag"] == "r4.1"
-        assert reloaded["snapshot_api_versions"]["quality-on-demand"] == "1.2.0-rc.1"
-        assert reloaded["warnings"][0]["code"] == "W001"
-
     def test_no_last_published_omitted(self):
         entry = ProgressEntry(
             repository="TestRepo",
@@ -159,6 +164,7 @@ class TestProgressData:
         d = data.to_dict()
 
         assert d["metadata"]["schema_version"] == "1.5.0"
+        assert d["metadata"]["collector_version"] == "1.5.0"
         assert d["metadata"]["last_checked"] == "2026-03-15T10:00:00Z"
         assert d["metadata"]["releases_master_updated"] == "2026-03-15T04:35:00Z"
         assert "collection_stats" not in d["metadata"]  # Full stats removed from output
@@ -169,10 +175,36 @@ class TestProgressData:
         assert d["meta_releases"][0]["name"] == "Sync26"
         assert len(d["progress"]) == 1
 
-        # Full YAML round-trip
-        yaml_str = yaml.dump(d, default_flow_style=False, sort_keys=False)
-        reloaded = yaml.safe_load(yaml_str)
-        assert reloaded["metadata"]["collector_version"] == "1.5.0"
+    def test_yaml_round_trip(self):
+        """The YAML output contract, covered once for a fully populated tree."""
+        import yaml  # only this test needs PyYAML
+
+        from scripts.yaml_compat import SafeDumper, SafeLoader
+
+        data = ProgressData(
+            last_updated="2026-03-15T10:00:00Z",
+            meta_releases=[MetaReleaseSummary("Sync26", 48, 35, 22, 8)],
+            progress=[_full_entry()],
+        )
+        d = data.to_dict()
+        yaml_str = yaml.dump(
+            d, Dumper=SafeDumper, default_flow_style=False, sort_keys=False,
+        )
+        assert yaml.load(yaml_str, Loader=SafeLoader) == d
+
+    @pytest.mark.parametrize("dumps", [models.dumps_json, models.dumps_json_line])
+    def test_dumps_json_fallback_is_identical(self, monkeypatch, dumps):
+        d = {
+            "metadata": {"last_updated": datetime(2026, 1, 5, tzinfo=timezone.utc)},
+            "progress": [{"note": "Zürich", "n": 1.5, "apis": []}],
+        }
+        fast = dumps(d)
+        monkeypatch.setattr(models, "orjson", None)
+        assert dumps(d) == fast
+
+    def test_dumps_json_renders_datetimes_with_str(self):
+        out = models.dumps_json({"at": datetime(2026, 1, 5, tzinfo=timezone.utc)})
+        assert '"2026-01-05 00:00:00+00:00"' in out
 
 
 class TestNewStates:
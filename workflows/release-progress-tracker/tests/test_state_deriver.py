@@ -1,10 +1,13 @@
 """Tests for state derivation logic."""
 
+import pytest
+
 from scripts.state_deriver import (
     derive_state,
     extract_draft_release_url_from_issue,
     find_matching_draft_release,
     find_matching_snapshot,
+    snapshot_branch_prefix,
 )
 from scripts.models import ProgressState
 
@@ -12,40 +15,34 @@ from scripts.models import ProgressState
 class TestDeriveState:
     """Test the 5-state derivation priority ordering."""
 
-    def test_none_type_returns_not_planned(self):
-        state = derive_state("none", "r4.1", False, [], [])
-        assert state == ProgressState.NOT_PLANNED
-
-    def test_missing_type_returns_not_planned(self):
-        state = derive_state(None, "r4.1", False, [], [])
-        assert state == ProgressState.NOT_PLANNED
-
-    def test_tag_exists_returns_published(self):
-        state = derive_state("pre-release-rc", "r4.1", True, [], [])
-        assert state == ProgressState.PUBLISHED
-
-    def test_published_takes_priority_over_snapshot(self):
-        """Tag exists should win even if snapshot branch also exists."""
-        state = derive_state(
-            "pre-release-rc", "r4.1", True,
-            ["release-snapshot/r4.1-abc123"], []
-        )
-        assert state == ProgressState.PUBLISHED
-
-    def test_snapshot_with_draft_returns_draft_ready(self):
-        state = derive_state(
-            "pre-release-rc", "r4.1", False,
-            ["release-snapshot/r4.1-abc123"],
-            [{"name": "r4.1 pre-release-rc", "tag_name": "r4.1"}],
-        )
-        assert state == ProgressState.DRAFT_READY
-
-    def test_snapshot_without_draft_returns_snapshot_active(self):
-        state = derive_state(
-            "pre-release-rc", "r4.1", False,
-            ["release-snapshot/r4.1-abc123"], []
-        )
-        assert state == ProgressState.SNAPSHOT_ACTIVE
+    # Priority order: NOT_PLANNED > PUBLISHED > DRAFT_READY > SNAPSHOT_ACTIVE > PLANNED
+    @pytest.mark.parametrize("rtype,tag,tag_exists,branches,drafts,expected", [
+        pytest.param("none", "r4.1", False, [], [], ProgressState.NOT_PLANNED,
+                     id="none_type_returns_not_planned"),
+        pytest.param(None, "r4.1", False, [], [], ProgressState.NOT_PLANNED,
+                     id="missing_type_returns_not_planned"),
+        pytest.param("pre-release-rc", "r4.1", True, [], [], ProgressState.PUBLISHED,
+                     id="tag_exists_returns_published"),
+        # Tag exists should win even if snapshot branch also exists.
+        pytest.param("pre-release-rc", "r4.1", True, ["release-snapshot/r4.1-abc123"], [],
+                     ProgressState.PUBLISHED,
+                     id="published_takes_priority_over_snapshot"),
+        pytest.param("pre-release-rc", "r4.1", False, ["release-snapshot/r4.1-abc123"],
+                     [{"name": "r4.1 pre-release-rc", "tag_name": "r4.1"}],
+                     ProgressState.DRAFT_READY,
+                     id="snapshot_with_draft_returns_draft_ready"),
+        pytest.param("pre-release-rc", "r4.1", False, ["release-snapshot/r4.1-abc123"], [],
+                     ProgressState.SNAPSHOT_ACTIVE,
+                     id="snapshot_without_draft_returns_snapshot_active"),
+        pytest.param("pre-release-rc", "r4.1", False, [], [], ProgressState.PLANNED,
+                     id="no_artifacts_returns_planned"),
+        # Snapshot for a different tag should not match.
+        pytest.param("pre-release-rc", "r4.1", False, ["release-snapshot/r3.2-def456"], [],
+                     ProgressState.PLANNED,
+                     id="unrelated_snapshot_branch_ignored"),
+    ])
+    def test_derive_state_priority(self, rtype, tag, tag_exists, branches, drafts, expected):
+        assert derive_state(rtype, tag, tag_exists, branches, drafts) == expected
 
     def test_release_issue_draft_ready_fallback_returns_draft_ready(self):
         state = derive_state(
@@ -63,55 +60,56 @@ class TestDeriveState:
         )
         assert state == ProgressState.DRAFT_READY
 
-    def test_no_artifacts_returns_planned(self):
-        state = derive_state("pre-release-rc", "r4.1", False, [], [])
-        assert state == ProgressState.PLANNED
-
-    def test_unrelated_snapshot_branch_ignored(self):
-        """Snapshot for a different tag should not match."""
-        state = derive_state(
-            "pre-release-rc", "r4.1", False,
-            ["release-snapshot/r3.2-def456"], []
-        )
-        assert state == ProgressState.PLANNED
-
-    def test_all_release_types_derive_planned(self):
+    @pytest.mark.parametrize("rtype", [
+        "pre-release-alpha",
+        "pre-release-rc",
+        "public-release",
+        "maintenance-release",
+    ])
+    def test_all_release_types_derive_planned(self, rtype):
         """All non-none release types with no artifacts → PLANNED."""
-        for rtype in ["pre-release-alpha", "pre-release-rc",
-                       "public-release", "maintenance-release"]:
-            state = derive_state(rtype, "r4.1", False, [], [])
-            assert state == ProgressState.PLANNED
+        state = derive_state(rtype, "r4.1", False, [], [])
+        assert state == ProgressState.PLANNED
 
 
 class TestFindMatchingSnapshot:
     """Test snapshot branch matching."""
 
-    def test_matches_correct_prefix(self):
-        result = find_matching_snapshot(
-            ["release-snapshot/r4.1-abc123", "main"], "r4.1"
-        )
-        assert result == "release-snapshot/r4.1-abc123"
-
-    def test_returns_first_match(self):
-        result = find_matching_snapshot(
-            ["release-snapshot/r4.1-first", "release-snapshot/r4.1-second"],
-            "r4.1",
-        )
-        assert result == "release-snapshot/r4.1-first"
-
-    def test_no_match_returns_none(self):
-        result = find_matching_snapshot(
-            ["release-snapshot/r3.2-abc123"], "r4.1"
-        )
-        assert result is None
-
-    def test_none_tag_returns_none(self):
-        result = find_matching_snapshot(["release-snapshot/r4.1-abc"], None)
-        assert result is None
-
-    def test_empty_branches_returns_none(self):
-        result = find_matching_snapshot([], "r4.1")
-        assert result is None
+    @pytest.mark.parametrize("branches,tag,expected", [
+        (["release-snapshot/r4.1-abc123", "main"], "r4.1",
+         "release-snapshot/r4.1-abc123"),
+        (["release-snapshot/r4.1-first", "release-snapshot/r4.1-second"], "r4.1",
+         "release-snapshot/r4.1-first"),
+        (["release-snapshot/r3.2-abc123"], "r4.1", None),
+        (["release-snapshot/r4.1-abc"], None, None),
+        ([], "r4.1", None),
+    ], ids=[
+        "matches_correct_prefix",
+        "returns_first_match",
+        "no_match",
+        "none_tag",
+        "empty_branches",
+    ])
+    def test_find_matching_snapshot(self, branches, tag, expected):
+        assert find_matching_snapshot(branches, tag) == expected
+
+    @pytest.mark.parametrize("n", [10, 100, 1000])
+    def test_match_after_many_other_snapshots(self, n):
+        branches = [f"release-snapshot/r{i}.2-abc" for i in range(n)]
+        branches.append("release-snapshot/r4.1-match")
+        assert find_matching_snapshot(branches, "r4.1") == "release-snapshot/r4.1-match"
+
+
+class TestSnapshotBranchPrefix:
+    def test_tag_specific_prefix(self):
+        assert snapshot_branch_prefix("r4.1") == "release-snapshot/r4.1-"
+
+    def test_prefix_excludes_longer_tags(self):
+        prefix = snapshot_branch_prefix("r4.1")
+        assert not "release-snapshot/r4.10-abc".startswith(prefix)
+
+    def test_no_tag_lists_all_snapshots(self):
+        assert snapshot_branch_prefix(None) == "release-snapshot/"
 
 
 class TestFindMatchingDraftRelease:
@@ -127,6 +125,31 @@ class TestFindMatchingDraftRelease:
         )
         assert result is not None
 
+    def test_matches_exact_tag(self):
+        release = {"name": "", "tag_name": "r4.1"}
+        assert find_matching_draft_release([release], "r4.1") is release
+
+    def test_matches_name_with_release_type_suffix(self):
+        release = {"name": "r4.1 pre-release-rc", "tag_name": ""}
+        assert find_matching_draft_release([release], "r4.1") is release
+
+    @pytest.mark.parametrize("name", ["Release r4.1", "r4.1-rc", "CAMARA r4.1 (RC)"])
+    def test_matches_name_mentioning_tag(self, name):
+        release = {"name": name, "tag_name": ""}
+        assert find_matching_draft_release([release], "r4.1") is release
+
+    def test_longer_tag_is_not_a_match(self):
+        """r4.1 must not match drafts for r4.10."""
+        result = find_matching_draft_release(
+            [{"name": "r4.10 pre-release-rc", "tag_name": "r4.10"}], "r4.1"
+        )
+        assert result is None
+
+    @pytest.mark.parametrize("name", ["Release r4.10", "r4.1.1"])
+    def test_longer_tag_in_title_is_not_a_match(self, name):
+        release = {"name": name, "tag_name": ""}
+        assert find_matching_draft_release([release], "r4.1") is None
+
 
 class TestExtractDraftReleaseUrlFromIssue:
     def test_extracts_plain_url(self):
@@ -2,36 +2,43 @@
 
 import pytest
 
-from scripts.warnings import generate_warnings, CHECKS
+from scripts import warnings as warnings_mod
+from scripts.warnings import applies_to, build_published_index, generate_warnings, CHECKS
 from scripts.models import (
-    ProgressEntry, ProgressState, ProgressWarning,
+    ProgressState, ProgressWarning,
     ApiEntry, ArtifactInfo, PublishedContext,
 )
 
+from .helpers import by_code
 
-def _make_entry(**overrides):
-    """Create a ProgressEntry with sensible defaults."""
-    defaults = {
-        "repository": "TestRepo",
-        "github_url": "https://github.com/camaraproject/TestRepo",
-        "state": ProgressState.PLANNED,
-        "target_release_tag": "r4.1",
-        "target_release_type": "pre-release-rc",
-    }
-    defaults.update(overrides)
-    return ProgressEntry(**defaults)
+# Read-only releases-master data shared by the W001 tests; the checks never
+# mutate repo_releases, so a tuple can be passed straight through.
+QOD_R41_RELEASES = ({
+    "release_tag": "r4.1",
+    "apis": ({"api_name": "quality-on-demand", "api_version": "1.1.0"},),
+},)
+
+# Exact warnings expected for the canonical conftest entries.
+EXPECTED_W001_DIVERGED = ProgressWarning(
+    "W001", "Plan targets quality-on-demand 2.0.0 but r4.1 published 1.1.0", "warning",
+)
+EXPECTED_W002_ORPHAN = ProgressWarning(
+    "W002",
+    "Snapshot branch release-snapshot/r4.1-abc123 exists but release type is 'none'",
+    "warning",
+)
 
 
 class TestGenerateWarnings:
     """Test the warning generation framework."""
 
-    def test_clean_entry_no_warnings(self):
-        entry = _make_entry(state=ProgressState.PLANNED)
+    def test_clean_entry_no_warnings(self, make_entry):
+        entry = make_entry(state=ProgressState.PLANNED)
         warnings = generate_warnings(entry, [])
         assert warnings == []
 
-    def test_returns_list_of_warning_objects(self):
-        entry = _make_entry(
+    def test_returns_list_of_warning_objects(self, make_entry):
+        entry = make_entry(
             state=ProgressState.NOT_PLANNED,
             target_release_type="none",
             artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.1-abc"),
@@ -44,86 +51,115 @@ class TestGenerateWarnings:
 class TestW001PublishedPlanDiverged:
     """Test W001: published but plan has moved on."""
 
-    def test_triggers_when_versions_differ(self):
-        entry = _make_entry(
+    def test_triggers_when_versions_differ(self, published_diverged_entry):
+        warnings = generate_warnings(published_diverged_entry, QOD_R41_RELEASES)
+        assert by_code(warnings).get("W001") == [EXPECTED_W001_DIVERGED]
+
+    def test_reports_every_diverged_api(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PUBLISHED,
-            apis=[ApiEntry("quality-on-demand", "2.0.0", "public")],
+            apis=[
+                ApiEntry("quality-on-demand", "2.0.0", "public"),
+                ApiEntry("qos-profiles", "1.1.0", "public"),
+                ApiEntry("qos-provisioning", "0.3.0", "public"),
+            ],
         )
         releases = [{
             "release_tag": "r4.1",
-            "apis": [{"api_name": "quality-on-demand", "api_version": "1.1.0"}],
+            "apis": [
+                {"api_name": "quality-on-demand", "api_version": "1.1.0"},
+                {"api_name": "qos-profiles", "api_version": "1.1.0"},
+                {"api_name": "qos-provisioning", "api_version": "0.2.0"},
+            ],
         }]
         warnings = generate_warnings(entry, releases)
-        w001 = [w for w in warnings if w.code == "W001"]
-        assert len(w001) == 1
-        assert "2.0.0" in w001[0].message
-        assert "1.1.0" in w001[0].message
+        w001 = [w.message for w in by_code(warnings).get("W001", [])]
+        assert w001 == [
+            "Plan targets quality-on-demand 2.0.0 but r4.1 published 1.1.0",
+            "Plan targets qos-provisioning 0.3.0 but r4.1 published 0.2.0",
+        ]
 
-    def test_no_trigger_when_versions_match(self):
-        entry = _make_entry(
-            state=ProgressState.PUBLISHED,
-            apis=[ApiEntry("quality-on-demand", "1.1.0", "public")],
-        )
+    def test_no_trigger_when_versions_match(self, published_matching_entry):
         releases = [{
             "release_tag": "r4.1",
             "apis": [{"api_name": "quality-on-demand", "api_version": "1.1.0-rc.2"}],
         }]
-        warnings = generate_warnings(entry, releases)
-        w001 = [w for w in warnings if w.code == "W001"]
+        warnings = generate_warnings(published_matching_entry, releases)
+        w001 = by_code(warnings).get("W001", [])
         assert len(w001) == 0
 
-    def test_no_trigger_for_non_published(self):
-        entry = _make_entry(
+    def test_no_trigger_for_non_published(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PLANNED,
             apis=[ApiEntry("quality-on-demand", "2.0.0", "rc")],
         )
-        releases = [{
-            "release_tag": "r4.1",
-            "apis": [{"api_name": "quality-on-demand", "api_version": "1.1.0"}],
-        }]
-        warnings = generate_warnings(entry, releases)
-        w001 = [w for w in warnings if w.code == "W001"]
+        warnings = generate_warnings(entry, QOD_R41_RELEASES)
+        w001 = by_code(warnings).get("W001", [])
         assert len(w001) == 0
 
 
+class TestBuildPublishedIndex:
+    def test_indexes_base_versions_by_repo_and_tag(self):
+        index = build_published_index([{
+            "repository": "TestRepo",
+            "release_tag": "r4.1",
+            "apis": [{"api_name": "quality-on-demand", "api_version": "1.1.0-rc.2"}],
+        }])
+        assert index == {("TestRepo", "r4.1"): {"quality-on-demand": "1.1.0"}}
+
+    def test_repository_override_for_single_repo_releases(self):
+        index = build_published_index(
+            [{"release_tag": "r4.1", "apis": []}], repository="TestRepo",
+        )
+        assert ("TestRepo", "r4.1") in index
+
+    def test_skips_incomplete_api_entries(self):
+        index = build_published_index([{
+            "repository": "TestRepo",
+            "release_tag": "r4.1",
+            "apis": [{"api_name": "quality-on-demand"}, {"api_version": "1.0.0"}],
+        }])
+        assert index == {("TestRepo", "r4.1"): {}}
+
+    def test_precomputed_index_used_for_w001(self, published_diverged_entry):
+        index = {("TestRepo", "r4.1"): {"quality-on-demand": "1.1.0"}}
+        warnings = generate_warnings(
+            published_diverged_entry, [{"release_tag": "r4.1"}], index,
+        )
+        assert by_code(warnings).get("W001") == [EXPECTED_W001_DIVERGED]
+
+
 class TestW002OrphanedSnapshot:
     """Test W002: snapshot exists but release type is none."""
 
-    def test_triggers_when_snapshot_and_not_planned(self):
-        entry = _make_entry(
-            state=ProgressState.NOT_PLANNED,
-            target_release_type="none",
-            artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.1-abc123"),
-        )
-        warnings = generate_warnings(entry, [])
-        w002 = [w for w in warnings if w.code == "W002"]
-        assert len(w002) == 1
-        assert "release-snapshot/r4.1-abc123" in w002[0].message
+    def test_triggers_when_snapshot_and_not_planned(self, orphan_snapshot_entry):
+        warnings = generate_warnings(orphan_snapshot_entry, [])
+        assert by_code(warnings).get("W002") == [EXPECTED_W002_ORPHAN]
 
-    def test_no_trigger_without_snapshot(self):
-        entry = _make_entry(
+    def test_no_trigger_without_snapshot(self, make_entry):
+        entry = make_entry(
             state=ProgressState.NOT_PLANNED,
             target_release_type="none",
         )
         warnings = generate_warnings(entry, [])
-        w002 = [w for w in warnings if w.code == "W002"]
+        w002 = by_code(warnings).get("W002", [])
         assert len(w002) == 0
 
-    def test_no_trigger_for_active_state(self):
-        entry = _make_entry(
+    def test_no_trigger_for_active_state(self, make_entry):
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             artifacts=ArtifactInfo(snapshot_branch="release-snapshot/r4.1-abc"),
         )
         warnings = generate_warnings(entry, [])
-        w002 = [w for w in warnings if w.code == "W002"]
+        w002 = by_code(warnings).get("W002", [])
         assert len(w002) == 0
 
 
 class TestW003PublishedNotInReleasesMaster:
     """Test W003: published release not found in releases-master.yaml."""
 
-    def test_triggers_when_published_tag_missing(self):
-        entry = _make_entry(
+    def test_triggers_when_published_tag_missing(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PUBLISHED,
             target_release_tag="r4.1",
         )
@@ -132,7 +168,7 @@ class TestW003PublishedNotInReleasesMaster:
             "apis": [{"api_name": "some-api", "api_version": "1.0.0"}],
         }]
         warnings = generate_warnings(entry, releases)
-        w003 = [w for w in warnings if w.code == "W003"]
+        w003 = by_code(warnings).get("W003", [])
         assert len(w003) == 1
         assert (
             w003[0].message
@@ -140,17 +176,17 @@ class TestW003PublishedNotInReleasesMaster:
             "Milestone data will be updated in the next 24 hours."
         )
 
-    def test_triggers_with_empty_releases_list(self):
-        entry = _make_entry(
+    def test_triggers_with_empty_releases_list(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PUBLISHED,
             target_release_tag="r4.1",
         )
         warnings = generate_warnings(entry, [])
-        w003 = [w for w in warnings if w.code == "W003"]
+        w003 = by_code(warnings).get("W003", [])
         assert len(w003) == 1
 
-    def test_no_trigger_when_tag_found(self):
-        entry = _make_entry(
+    def test_no_trigger_when_tag_found(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PUBLISHED,
             target_release_tag="r4.1",
         )
@@ -159,33 +195,42 @@ class TestW003PublishedNotInReleasesMaster:
             "apis": [{"api_name": "some-api", "api_version": "1.1.0"}],
         }]
         warnings = generate_warnings(entry, releases)
-        w003 = [w for w in warnings if w.code == "W003"]
+        w003 = by_code(warnings).get("W003", [])
         assert len(w003) == 0
 
-    def test_no_trigger_for_non_published_state(self):
-        entry = _make_entry(
+    def test_precomputed_index_used_for_lookup(self, make_entry):
+        entry = make_entry(
+            state=ProgressState.PUBLISHED,
+            target_release_tag="r4.1",
+        )
+        index = {("TestRepo", "r4.1"): {}}
+        warnings = generate_warnings(entry, [], index)
+        assert "W003" not in by_code(warnings)
+
+    def test_no_trigger_for_non_published_state(self, make_entry):
+        entry = make_entry(
             state=ProgressState.DRAFT_READY,
             target_release_tag="r4.1",
         )
         warnings = generate_warnings(entry, [])
-        w003 = [w for w in warnings if w.code == "W003"]
+        w003 = by_code(warnings).get("W003", [])
         assert len(w003) == 0
 
-    def test_no_trigger_when_no_target_tag(self):
-        entry = _make_entry(
+    def test_no_trigger_when_no_target_tag(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PUBLISHED,
             target_release_tag=None,
         )
         warnings = generate_warnings(entry, [])
-        w003 = [w for w in warnings if w.code == "W003"]
+        w003 = by_code(warnings).get("W003", [])
         assert len(w003) == 0
 
 
 class TestW004MetaReleaseMismatch:
     """Test W004: release found by tag prefix has different meta_release."""
 
-    def test_triggers_when_meta_release_differs(self):
-        entry = _make_entry(
+    def test_triggers_when_meta_release_differs(self, make_entry):
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release="Sync26",
             target_release_tag="r2.1",
@@ -195,13 +240,13 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "Fall25",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 1
         assert "Fall25" in w004[0].message
         assert "Sync26" in w004[0].message
 
-    def test_no_trigger_when_meta_release_matches(self):
-        entry = _make_entry(
+    def test_no_trigger_when_meta_release_matches(self, make_entry):
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release="Sync26",
             target_release_tag="r2.1",
@@ -211,12 +256,12 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "Sync26",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
-    def test_no_trigger_when_release_meta_is_independent(self):
+    def test_no_trigger_when_release_meta_is_independent(self, make_entry):
         """Independent releases should not trigger W004."""
-        entry = _make_entry(
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release="Sync26",
             target_release_tag="r1.1",
@@ -226,12 +271,12 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "Independent",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
-    def test_no_trigger_when_release_meta_is_legacy_sandbox(self):
+    def test_no_trigger_when_release_meta_is_legacy_sandbox(self, make_entry):
         """Legacy 'None (Sandbox)' label should not trigger W004 (backward compat)."""
-        entry = _make_entry(
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release="Sync26",
             target_release_tag="r1.1",
@@ -241,12 +286,12 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "None (Sandbox)",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
-    def test_no_trigger_when_release_meta_is_none(self):
+    def test_no_trigger_when_release_meta_is_none(self, make_entry):
         """Releases with no meta_release label should not trigger W004."""
-        entry = _make_entry(
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release="Sync26",
             target_release_tag="r1.1",
@@ -256,12 +301,12 @@ class TestW004MetaReleaseMismatch:
             "meta_release": None,
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
-    def test_no_trigger_when_plan_meta_is_none(self):
+    def test_no_trigger_when_plan_meta_is_none(self, make_entry):
         """Independent repos with no meta_release in plan skip W004."""
-        entry = _make_entry(
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             meta_release=None,
             target_release_tag="r1.1",
@@ -271,12 +316,12 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "Sync26",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
-    def test_no_trigger_for_different_tag_prefix(self):
+    def test_no_trigger_for_different_tag_prefix(self, make_entry):
         """Releases with a different tag prefix should not trigger W004."""
-        entry = _make_entry(
+        entry = make_entry(
             meta_release="Sync26",
             target_release_tag="r2.1",
         )
@@ -285,58 +330,58 @@ class TestW004MetaReleaseMismatch:
             "meta_release": "Fall25",
         }]
         warnings = generate_warnings(entry, releases)
-        w004 = [w for w in warnings if w.code == "W004"]
+        w004 = by_code(warnings).get("W004", [])
         assert len(w004) == 0
 
 
 class TestW005NoCallerWorkflow:
     """Test W005: active plan but no caller workflow."""
 
-    def test_triggers_when_planned_without_workflow(self):
-        entry = _make_entry(
+    def test_triggers_when_planned_without_workflow(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PLANNED,
             artifacts=ArtifactInfo(has_caller_workflow=False),
         )
         warnings = generate_warnings(entry, [])
-        w005 = [w for w in warnings if w.code == "W005"]
+        w005 = by_code(warnings).get("W005", [])
         assert len(w005) == 1
         assert "caller workflow" in w005[0].message
 
-    def test_no_trigger_when_workflow_present(self):
-        entry = _make_entry(
+    def test_no_trigger_when_workflow_present(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PLANNED,
             artifacts=ArtifactInfo(has_caller_workflow=True),
         )
         warnings = generate_warnings(entry, [])
-        w005 = [w for w in warnings if w.code == "W005"]
+        w005 = by_code(warnings).get("W005", [])
         assert len(w005) == 0
 
-    def test_no_trigger_for_not_planned(self):
-        entry = _make_entry(
+    def test_no_trigger_for_not_planned(self, make_entry):
+        entry = make_entry(
             state=ProgressState.NOT_PLANNED,
             target_release_type="none",
             artifacts=ArtifactInfo(has_caller_workflow=False),
         )
         warnings = generate_warnings(entry, [])
-        w005 = [w for w in warnings if w.code == "W005"]
+        w005 = by_code(warnings).get("W005", [])
         assert len(w005) == 0
 
-    def test_no_trigger_for_snapshot_active(self):
-        entry = _make_entry(
+    def test_no_trigger_for_snapshot_active(self, make_entry):
+        entry = make_entry(
             state=ProgressState.SNAPSHOT_ACTIVE,
             artifacts=ArtifactInfo(has_caller_workflow=False),
         )
         warnings = generate_warnings(entry, [])
-        w005 = [w for w in warnings if w.code == "W005"]
+        w005 = by_code(warnings).get("W005", [])
         assert len(w005) == 0
 
-    def test_no_trigger_when_not_checked(self):
-        entry = _make_entry(
+    def test_no_trigger_when_not_checked(self, make_entry):
+        entry = make_entry(
             state=ProgressState.PLANNED,
             artifacts=ArtifactInfo(has_caller_workflow=None),
         )
         warnings = generate_warnings(entry, [])
-        w005 = [w for w in warnings if w.code == "W005"]
+        w005 = by_code(warnings).get("W005", [])
         assert len(w005) == 0
 
 
@@ -346,18 +391,28 @@ class TestChecksRegistry:
     def test_checks_list_is_populated(self):
         assert len(CHECKS) >= 5
 
-    def test_custom_check_can_be_added(self):
+    def test_custom_check_can_be_added(self, monkeypatch, make_entry):
         """Verify a new check function integrates with generate_warnings."""
-        def _check_always_warn(entry, releases):
+        def _check_always_warn(entry, releases, published_index):
             return [ProgressWarning("W999", "test warning", "info")]
 
-        original_checks = CHECKS.copy()
-        try:
-            CHECKS.append(_check_always_warn)
-            entry = _make_entry()
-            warnings = generate_warnings(entry, [])
-            w999 = [w for w in warnings if w.code == "W999"]
-            assert len(w999) == 1
-        finally:
-            CHECKS.clear()
-            CHECKS.extend(original_checks)
+        monkeypatch.setattr(warnings_mod, "CHECKS", CHECKS + [_check_always_warn])
+        entry = make_entry()
+        warnings = generate_warnings(entry, [])
+        w999 = by_code(warnings).get("W999", [])
+        assert len(w999) == 1
+
+    def test_state_restricted_check_skipped_for_other_states(self, monkeypatch, make_entry):
+        calls = []
+
+        @applies_to(ProgressState.PUBLISHED)
+        def _check_published_only(entry, releases, published_index):
+            calls.append(entry.state)
+            return [ProgressWarning("W998", "published only", "info")]
+
+        monkeypatch.setattr(warnings_mod, "CHECKS", CHECKS + [_check_published_only])
+        generate_warnings(make_entry(state=ProgressState.PLANNED), [])
+        published = generate_warnings(make_entry(state=ProgressState.PUBLISHED), [])
+
+        assert calls == [ProgressState.PUBLISHED]
+        assert "W998" in by_code(published)